@@ -11,9 +11,16 @@ class Settings:
     PORT: int = 8000
     DEBUG: bool = True
     
+    # 관리자 설정 (설정하지 않으면 /admin 엔드포인트와 요청 프로파일링이 비활성화됨)
+    ADMIN_TOKEN: Optional[str] = None
+    
     # 게임 설정
     MAX_PLAYERS_PER_ROOM: int = 10
     GAME_UPDATE_INTERVAL: int = 2  # seconds
+    ROUND_DURATION: int = 60  # seconds, 라운드 제한 시간
+    ROUNDS_PER_GAME: int = 3  # 게임당 라운드 수
+    CLAIM_DURATION: int = 20  # seconds, 선점 후 자동 해제까지의 시간
+    TIMER_TICK: float = 0.1  # seconds, 타이머 휠 틱 간격
     
     # 환경변수에서 설정 로드
     @classmethod
@@ -23,6 +30,10 @@ class Settings:
         cls.HOST = os.getenv("HOST", cls.HOST)
         cls.PORT = int(os.getenv("PORT", cls.PORT))
         cls.DEBUG = os.getenv("DEBUG", "true").lower() == "true"
+        cls.ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", cls.ADMIN_TOKEN)
+        cls.ROUND_DURATION = int(os.getenv("ROUND_DURATION", cls.ROUND_DURATION))
+        cls.ROUNDS_PER_GAME = int(os.getenv("ROUNDS_PER_GAME", cls.ROUNDS_PER_GAME))
+        cls.CLAIM_DURATION = int(os.getenv("CLAIM_DURATION", cls.CLAIM_DURATION))
 
 settings = Settings()
 settings.load_from_env()
\ No newline at end of file
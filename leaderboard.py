@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class _Fenwick:
+    """점수별 플레이어 수를 저장하는 Fenwick 트리 (점수 범위가 커지면 2배로 확장)"""
+
+    def __init__(self, size: int = 64):
+        self.size = size  # 항상 2의 거듭제곱
+        self.counts = [0] * size
+        self.tree = [0] * (size + 1)
+
+    def grow(self, min_index: int) -> None:
+        size = self.size
+        while size <= min_index:
+            size *= 2
+        self.counts += [0] * (size - self.size)
+        self.size = size
+        # 확장 시 O(size) 로 트리를 다시 만듦 (점수 범위가 2배가 될 때만 발생하므로 상각 O(1))
+        tree = [0] + self.counts
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def add(self, index: int, delta: int) -> None:
+        self.counts[index] += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index: int) -> int:
+        """counts[0..index] 의 합"""
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, k: int) -> int:
+        """prefix(i) >= k 인 가장 작은 i (k >= 1)"""
+        pos = 0
+        step = self.size
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step //= 2
+        return pos  # 1-based 위치 pos+1 == 0-based 인덱스 pos
+
+
+class Leaderboard:
+    """점수 증가를 O(log S) 로 반영하고 상위 K명/플레이어 순위를 빠르게 조회하는 리더보드
+
+    점수별 플레이어 수를 Fenwick 트리로, 점수별 플레이어 목록을 버킷(dict)으로 관리합니다.
+    - increment / rank: O(log S)  (S: 최고 점수)
+    - top(k): O(K + 방문한 점수 수 × log S)
+    순위는 동점자가 같은 순위를 갖는 방식(1, 2, 2, 4 ...)이며, 동점자끼리는 먼저 그 점수에 도달한 순서로 나열합니다.
+    """
+
+    def __init__(self):
+        self._scores: Dict[str, int] = {}
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._counts = _Fenwick()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def score(self, player: str) -> Optional[int]:
+        return self._scores.get(player)
+
+    def increment(self, player: str, delta: int = 1) -> int:
+        """플레이어 점수를 delta 만큼 올리고 새 점수를 반환합니다"""
+        old = self._scores.get(player)
+        new = (old or 0) + delta
+        if new < 0:
+            raise ValueError("점수는 0보다 작을 수 없습니다")
+        if old is not None:
+            self._counts.add(old, -1)
+            bucket = self._buckets[old]
+            del bucket[player]
+            if not bucket:
+                del self._buckets[old]
+        if new >= self._counts.size:
+            self._counts.grow(new)
+        self._counts.add(new, 1)
+        self._buckets.setdefault(new, {})[player] = None
+        self._scores[player] = new
+        return new
+
+    def rank(self, player: str) -> Optional[int]:
+        """플레이어 순위 (1부터 시작, 없는 플레이어는 None)"""
+        score = self._scores.get(player)
+        if score is None:
+            return None
+        return len(self._scores) - self._counts.prefix(score) + 1
+
+    def top(self, k: int) -> List[Tuple[int, str, int]]:
+        """상위 k명의 (순위, 플레이어, 점수) 목록"""
+        result: List[Tuple[int, str, int]] = []
+        total = len(self._scores)
+        below = total  # 현재 점수 이하인 플레이어 수
+        while below > 0 and len(result) < k:
+            score = self._counts.find(below)  # below 명을 포함하는 가장 높은 점수
+            below = self._counts.prefix(score - 1) if score > 0 else 0
+            rank = total - (below + self._counts.counts[score]) + 1
+            for player in self._buckets[score]:
+                result.append((rank, player, score))
+                if len(result) >= k:
+                    break
+        return result
+
+
+if __name__ == "__main__":
+    # 벤치마크: 플레이어 수에 따른 갱신/순위/상위 K 조회 지연 시간
+    import random
+    import time
+
+    rng = random.Random(0)
+    print(f"{'players':>9} | {'claims':>10} | {'increment µs':>12} | {'rank µs':>8} | {'top10 µs':>9} | {'top100 µs':>10}")
+    for n_players in (1_000, 10_000, 100_000, 1_000_000):
+        board = Leaderboard()
+        players = [f"player{i}" for i in range(n_players)]
+        claims = 3 * n_players
+        # 일부 플레이어에게 점수가 몰리도록 편향된 분포로 선점
+        picks = [players[min(int(rng.paretovariate(1.2)) - 1, n_players - 1)] if rng.random() < 0.3
+                 else players[rng.randrange(n_players)] for _ in range(claims)]
+
+        start = time.perf_counter()
+        for player in picks:
+            board.increment(player)
+        increment_us = (time.perf_counter() - start) / claims * 1e6
+
+        sample = rng.sample(players, 1000)
+        start = time.perf_counter()
+        for player in sample:
+            board.rank(player)
+        rank_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        def timed_top(k: int, repeat: int = 200) -> float:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                board.top(k)
+            return (time.perf_counter() - start) / repeat * 1e6
+
+        print(f"{n_players:>9,} | {claims:>10,} | {increment_us:>12.2f} | {rank_us:>8.2f} | "
+              f"{timed_top(10):>9.1f} | {timed_top(100):>10.1f}")
@@ -1,8 +1,10 @@
-from fastapi import FastAPI, Body, Query, HTTPException
+from fastapi import FastAPI, Body, Query, HTTPException, Request, Header
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
+import hmac
 import os
 
 # -------------------------------
@@ -13,10 +15,13 @@ from fastapi_mcp.server import FastApiMCP
 # 주차 게임 관련 import
 from models import (
     ParkingLotResponse, GameRoom, OccupySpaceRequest, 
-    OccupySpaceResponse, GameStatsResponse
+    OccupySpaceResponse, GameStatsResponse, RankingResponse, PlayerRankResponse
 )
 from parking_service import parking_service
 from ai_service import ai_service
+from wire_format import negotiate, encode_room, encode_stats, encode_occupy, MSGPACK_RESPONSES
+from config import settings
+import profiler
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -25,6 +30,23 @@ app = FastAPI(
     description="FastAPI 엔드포인트를 MCP 도구로 사용하는 예제",
 )
 
+@app.on_event("startup")
+async def start_game_timers():
+    """라운드/선점 타이머를 처리하는 타이머 휠 스케줄러 시작"""
+    parking_service.start_timers()
+
+def _is_admin(token: Optional[str]) -> bool:
+    # 헤더 값은 latin-1 로 디코드된 원래 바이트이므로 latin-1 로 되돌리고, 설정값은 UTF-8 바이트로 비교
+    # (비ASCII 토큰도 클라이언트가 UTF-8 로 보내면 일치하며, compare_digest 가 TypeError 를 내지 않음)
+    return (
+        bool(settings.ADMIN_TOKEN)
+        and token is not None
+        and hmac.compare_digest(token.encode("latin-1"), settings.ADMIN_TOKEN.encode("utf-8"))
+    )
+
+# X-Profile: 1 헤더와 관리자 토큰이 있는 요청만 프로파일링하여 X-Profile-Id 로 결과를 연결
+app.add_middleware(profiler.RequestProfileMiddleware, is_admin=_is_admin)
+
 # Pydantic 모델 정의
 class SummarizeRequest(BaseModel):
     text: str
@@ -161,13 +183,14 @@ async def create_parking_game(parking_lot_id: int = Query(..., description="주
     response_model=GameRoom,
     operation_id="get_parking_game",
     tags=["Parking Game"],
+    responses=MSGPACK_RESPONSES,
 )
-async def get_parking_game(room_id: str):
-    """게임 룸 정보를 가져옵니다"""
+async def get_parking_game(room_id: str, request: Request):
+    """게임 룸 정보를 가져옵니다 (Accept: application/msgpack 이면 압축 바이너리 형식)"""
     room = parking_service.get_game_room(room_id)
     if not room:
         raise HTTPException(status_code=404, detail="게임 룸을 찾을 수 없습니다")
-    return room
+    return negotiate(request, room, lambda: encode_room(room))
 
 @app.post(
     "/api/parking/game/{room_id}/join",
@@ -178,7 +201,7 @@ async def join_parking_game(room_id: str, player_name: str = Query(..., descript
     """게임에 참가합니다"""
     success = parking_service.join_game(room_id, player_name)
     if not success:
-        raise HTTPException(status_code=400, detail="게임 참가에 실패했습니다")
+        raise HTTPException(status_code=400, detail="게임 참가에 실패했습니다 (없는 게임 룸, 종료된 게임 또는 이미 참가한 플레이어)")
     return {"message": f"{player_name}님이 게임에 참가했습니다"}
 
 @app.post(
@@ -186,32 +209,68 @@ async def join_parking_game(room_id: str, player_name: str = Query(..., descript
     response_model=OccupySpaceResponse,
     operation_id="occupy_parking_space",
     tags=["Parking Game"],
+    responses=MSGPACK_RESPONSES,
 )
-async def occupy_parking_space(request: OccupySpaceRequest):
-    """주차 공간을 선점합니다"""
+async def occupy_parking_space(request: OccupySpaceRequest, http_request: Request):
+    """주차 공간을 선점합니다 (Accept: application/msgpack 이면 압축 바이너리 형식)"""
     success, message, space = parking_service.occupy_space(
         request.room_id, request.space_id, request.player_name
     )
     
-    return OccupySpaceResponse(
+    result = OccupySpaceResponse(
         success=success,
         message=message,
         space=space
     )
+    return negotiate(http_request, result, lambda: encode_occupy(result))
 
 @app.get(
     "/api/parking/game/{room_id}/stats",
     response_model=GameStatsResponse,
     operation_id="get_parking_game_stats",
     tags=["Parking Game"],
+    responses=MSGPACK_RESPONSES,
 )
-async def get_parking_game_stats(room_id: str):
-    """게임 통계를 가져옵니다"""
+async def get_parking_game_stats(room_id: str, request: Request):
+    """게임 통계를 가져옵니다 (Accept: application/msgpack 이면 압축 바이너리 형식)"""
     stats = parking_service.get_game_stats(room_id)
     if not stats:
         raise HTTPException(status_code=404, detail="게임 룸을 찾을 수 없습니다")
     
-    return GameStatsResponse(**stats)
+    return negotiate(request, GameStatsResponse(**stats), lambda: encode_stats(stats))
+
+@app.get(
+    "/api/parking/rankings",
+    response_model=RankingResponse,
+    operation_id="get_parking_rankings",
+    tags=["Parking Game"],
+)
+async def get_parking_rankings(k: int = Query(10, ge=1, le=1000, description="조회할 상위 순위 수")):
+    """모든 게임 룸의 선점 횟수를 합산한 전체 랭킹 상위 k명을 가져옵니다"""
+    return RankingResponse(**parking_service.get_rankings(None, k))
+
+@app.get(
+    "/api/parking/rankings/lots/{parking_lot_id}",
+    response_model=RankingResponse,
+    operation_id="get_parking_lot_rankings",
+    tags=["Parking Game"],
+)
+async def get_parking_lot_rankings(parking_lot_id: int, k: int = Query(10, ge=1, le=1000, description="조회할 상위 순위 수")):
+    """주차장(순번)별 랭킹 상위 k명을 가져옵니다"""
+    return RankingResponse(**parking_service.get_rankings(parking_lot_id, k))
+
+@app.get(
+    "/api/parking/rankings/players/{player_name}",
+    response_model=PlayerRankResponse,
+    operation_id="get_player_rank",
+    tags=["Parking Game"],
+)
+async def get_player_rank(player_name: str, parking_lot_id: Optional[int] = Query(None, description="주차장 순번 (생략 시 전체 랭킹)")):
+    """플레이어의 전체 또는 주차장별 순위를 가져옵니다"""
+    rank = parking_service.get_player_rank(player_name, parking_lot_id)
+    if not rank:
+        raise HTTPException(status_code=404, detail="랭킹에 없는 플레이어입니다")
+    return PlayerRankResponse(**rank)
 
 
 # ---------------------------------------------------------------------
@@ -307,6 +366,33 @@ async def ai_parking_search(query: str = Query(..., description="검색 쿼리")
     }
 
 
+# ---------------------------------------------------------------------
+#  관리자 API 엔드포인트들 (MCP 도구/문서에 노출하지 않음)
+# ---------------------------------------------------------------------
+
+@app.get("/admin/profile", include_in_schema=False)
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0, le=120, description="샘플링 시간(초)"),
+    interval_ms: float = Query(5.0, ge=1, le=100, description="샘플링 간격(밀리초)"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """실행 중인 프로세스를 seconds 동안 샘플링하여 collapsed stack 을 반환합니다"""
+    if not _is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
+    sampler = await profiler.profile_for(seconds, interval_ms / 1000)
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
+@app.get("/admin/profile/requests/{profile_id}", include_in_schema=False)
+async def admin_request_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """X-Profile 헤더로 프로파일링한 요청의 결과를 가져옵니다"""
+    if not _is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
+    profile = profiler.request_profiles.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    return profile
+
+
 # ---------------------------------------------------------------------
 #  3. MCP 서버 인스턴스 생성
 # ---------------------------------------------------------------------
@@ -14,6 +14,7 @@ class ParkingSpace(BaseModel):
     status: ParkingSpaceStatus = ParkingSpaceStatus.AVAILABLE
     occupied_by: Optional[str] = None
     occupied_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None  # 선점이 자동 해제되는 시각
 
 class ParkingLot(BaseModel):
     순번: int
@@ -40,6 +41,9 @@ class GameRoom(BaseModel):
     players: List[str] = []
     created_at: datetime
     is_active: bool = True
+    round_number: int = 0
+    round_ends_at: Optional[datetime] = None
+    scores: Dict[str, int] = {}  # player_name: 라운드 종료 시점마다 누적된 점수
 
 class OccupySpaceRequest(BaseModel):
     room_id: str
@@ -57,4 +61,25 @@ class GameStatsResponse(BaseModel):
     occupied_spaces: int
     available_spaces: int
     players: List[str]
-    leaderboard: Dict[str, int]  # player_name: occupied_count
\ No newline at end of file
+    leaderboard: Dict[str, int]  # player_name: occupied_count
+    is_active: bool = True
+    round_number: int = 0
+    round_ends_at: Optional[datetime] = None
+    scores: Dict[str, int] = {}
+
+class RankingEntry(BaseModel):
+    rank: int
+    player_name: str
+    score: int  # 선점한 주차 공간 수
+
+class RankingResponse(BaseModel):
+    parking_lot_id: Optional[int] = None  # None 이면 전체 랭킹
+    total_players: int
+    rankings: List[RankingEntry]
+
+class PlayerRankResponse(BaseModel):
+    player_name: str
+    parking_lot_id: Optional[int] = None
+    rank: int
+    score: int
+    total_players: int
\ No newline at end of file
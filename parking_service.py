@@ -1,9 +1,12 @@
 import httpx
 import asyncio
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
+from config import settings
 from models import ParkingLot, ParkingSpace, GameRoom, ParkingSpaceStatus
+from timer_wheel import TimerWheel, TimerHandle
+from leaderboard import Leaderboard
 
 class ParkingGameService:
     def __init__(self):
@@ -12,6 +15,19 @@ class ParkingGameService:
         # 한국 공공데이터포털 API 엔드포인트
         self.api_base_url = "https://api.odcloud.kr/api"
         self.service_key = "15064338/v1/uddi:91ea9cb0-f9d1-48ab-ab53-89c0a6b94451"
+        # 라운드 종료/선점 만료는 룸마다 태스크를 만들지 않고 하나의 타이머 휠에서 처리
+        self.timer_wheel = TimerWheel(tick=settings.TIMER_TICK)
+        self._timer_task: Optional[asyncio.Task] = None
+        self._round_timers: Dict[str, TimerHandle] = {}  # room_id: 라운드 종료 타이머
+        self._claim_timers: Dict[str, Dict[int, TimerHandle]] = {}  # room_id: {space_id: 선점 만료 타이머}
+        # 모든 룸의 선점 횟수를 합산한 전체/주차장별(순번) 랭킹 (선점할 때마다 점진적으로 갱신)
+        self.global_leaderboard = Leaderboard()
+        self.lot_leaderboards: Dict[int, Leaderboard] = {}
+    
+    def start_timers(self):
+        """타이머 휠 스케줄러 태스크를 시작합니다 (앱 시작 시 한 번 호출)"""
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self.timer_wheel.run())
     
     async def fetch_parking_data(self, page: int = 1, per_page: int = 10) -> List[ParkingLot]:
         """한국 공공데이터포털 API에서 주차장 데이터를 가져옵니다"""
@@ -101,6 +117,61 @@ class ParkingGameService:
                 created_at=datetime.now()
             )
             self.game_rooms[room_id] = game_room
+            # 첫 라운드는 첫 플레이어가 참가할 때 시작 (아무도 없는 방에서 라운드가 흘러가지 않도록)
+    
+    def _start_round(self, room: GameRoom):
+        """다음 라운드를 시작하고 종료 타이머를 등록합니다"""
+        room.round_number += 1
+        room.round_ends_at = datetime.now() + timedelta(seconds=settings.ROUND_DURATION)
+        self._round_timers[room.room_id] = self.timer_wheel.call_later(
+            settings.ROUND_DURATION, self._end_round, room.room_id
+        )
+    
+    def _end_round(self, room_id: str):
+        """라운드 종료: 보유 중인 주차 공간 수만큼 점수를 주고 모든 선점을 해제합니다"""
+        room = self.game_rooms.get(room_id)
+        self._round_timers.pop(room_id, None)
+        if not room or not room.is_active:
+            return
+        
+        for handle in self._claim_timers.pop(room_id, {}).values():
+            handle.cancel()
+        for space in room.parking_lot.spaces:
+            if space.status == ParkingSpaceStatus.OCCUPIED:
+                room.scores[space.occupied_by] = room.scores.get(space.occupied_by, 0) + 1
+                self._release(space)
+        
+        if room.round_number >= settings.ROUNDS_PER_GAME:
+            room.is_active = False
+            room.round_ends_at = None
+        else:
+            self._start_round(room)
+    
+    def _expire_claim(self, room_id: str, space_id: int):
+        """선점 시간이 지난 주차 공간을 자동으로 해제합니다"""
+        self._claim_timers.get(room_id, {}).pop(space_id, None)
+        room = self.game_rooms.get(room_id)
+        space = self._find_space(room, space_id) if room else None
+        if space:
+            self._release(space)
+    
+    @staticmethod
+    def _find_space(room: GameRoom, space_id: int) -> Optional[ParkingSpace]:
+        spaces = room.parking_lot.spaces
+        # 주차 공간 ID 는 1부터 순서대로 부여되므로 대부분 바로 찾음
+        if 0 < space_id <= len(spaces) and spaces[space_id - 1].id == space_id:
+            return spaces[space_id - 1]
+        for s in spaces:
+            if s.id == space_id:
+                return s
+        return None
+    
+    @staticmethod
+    def _release(space: ParkingSpace):
+        space.status = ParkingSpaceStatus.AVAILABLE
+        space.occupied_by = None
+        space.occupied_at = None
+        space.expires_at = None
     
     def get_game_room(self, room_id: str) -> Optional[GameRoom]:
         """게임 룸 정보를 가져옵니다"""
@@ -109,8 +180,10 @@ class ParkingGameService:
     def join_game(self, room_id: str, player_name: str) -> bool:
         """플레이어가 게임에 참가합니다"""
         room = self.game_rooms.get(room_id)
-        if room and player_name not in room.players:
+        if room and room.is_active and player_name not in room.players:
             room.players.append(player_name)
+            if room.round_number == 0:
+                self._start_round(room)
             return True
         return False
     
@@ -120,15 +193,14 @@ class ParkingGameService:
         if not room:
             return False, "게임 룸을 찾을 수 없습니다", None
         
+        if not room.is_active:
+            return False, "이미 종료된 게임입니다", None
+        
         if player_name not in room.players:
             return False, "게임에 참가하지 않은 플레이어입니다", None
         
         # 해당 공간 찾기
-        space = None
-        for s in room.parking_lot.spaces:
-            if s.id == space_id:
-                space = s
-                break
+        space = self._find_space(room, space_id)
         
         if not space:
             return False, "존재하지 않는 주차 공간입니다", None
@@ -140,6 +212,16 @@ class ParkingGameService:
         space.status = ParkingSpaceStatus.OCCUPIED
         space.occupied_by = player_name
         space.occupied_at = datetime.now()
+        space.expires_at = space.occupied_at + timedelta(seconds=settings.CLAIM_DURATION)
+        self._claim_timers.setdefault(room_id, {})[space_id] = self.timer_wheel.call_later(
+            settings.CLAIM_DURATION, self._expire_claim, room_id, space_id
+        )
+        
+        self.global_leaderboard.increment(player_name)
+        lot_id = room.parking_lot.순번
+        if lot_id not in self.lot_leaderboards:
+            self.lot_leaderboards[lot_id] = Leaderboard()
+        self.lot_leaderboards[lot_id].increment(player_name)
         
         return True, "주차 공간을 성공적으로 선점했습니다!", space
     
@@ -166,7 +248,43 @@ class ParkingGameService:
             "occupied_spaces": occupied_spaces,
             "available_spaces": available_spaces,
             "players": room.players,
-            "leaderboard": leaderboard
+            "leaderboard": leaderboard,
+            "is_active": room.is_active,
+            "round_number": room.round_number,
+            "round_ends_at": room.round_ends_at,
+            "scores": room.scores
+        }
+
+    def _get_leaderboard(self, parking_lot_id: Optional[int]) -> Optional[Leaderboard]:
+        if parking_lot_id is None:
+            return self.global_leaderboard
+        return self.lot_leaderboards.get(parking_lot_id)
+    
+    def get_rankings(self, parking_lot_id: Optional[int] = None, k: int = 10) -> dict:
+        """전체 또는 주차장별 상위 k명의 랭킹을 가져옵니다"""
+        board = self._get_leaderboard(parking_lot_id)
+        if board is None:
+            return {"parking_lot_id": parking_lot_id, "total_players": 0, "rankings": []}
+        return {
+            "parking_lot_id": parking_lot_id,
+            "total_players": len(board),
+            "rankings": [
+                {"rank": rank, "player_name": player, "score": score}
+                for rank, player, score in board.top(k)
+            ]
+        }
+    
+    def get_player_rank(self, player_name: str, parking_lot_id: Optional[int] = None) -> Optional[dict]:
+        """플레이어의 전체 또는 주차장별 순위를 가져옵니다"""
+        board = self._get_leaderboard(parking_lot_id)
+        if board is None or board.score(player_name) is None:
+            return None
+        return {
+            "player_name": player_name,
+            "parking_lot_id": parking_lot_id,
+            "rank": board.rank(player_name),
+            "score": board.score(player_name),
+            "total_players": len(board)
         }
 
 # 싱글톤 인스턴스
@@ -0,0 +1,151 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Callable, Optional, Set
+
+
+class StackSampler:
+    """실행 중인 프로세스의 스택을 주기적으로 샘플링하는 프로파일러
+
+    별도 스레드에서 interval 초마다 sys._current_frames() 로 각 스레드의 스택을 읽어
+    "스레드;파일:함수;파일:함수 ..." 형태로 횟수를 셉니다 (flame graph 용 collapsed stack 형식).
+    대상 코드에 훅을 걸지 않으므로 샘플링 중에도 오버헤드가 작고, 중지하면 비용이 없습니다.
+
+    샘플러 스레드도 GIL 을 얻어야 실행되므로, 다른 스레드가 CPU 를 쓰는 동안의 실제 샘플 간격은
+    interval 이 아니라 sys.getswitchinterval() (기본 5ms) 에 가깝습니다. 수 ms 이하의 짧은 구간을
+    보려면 샘플링 대신 결정적 프로파일러(profile_request 의 cProfile)를 사용합니다.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Set[int]] = None):
+        self.interval = interval
+        self.thread_ids = thread_ids  # None 이면 샘플러 자신을 제외한 모든 스레드
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                stack.reverse()
+                self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope 에서 바로 읽을 수 있는 collapsed stack 텍스트"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+async def profile_for(seconds: float, interval: float = 0.005) -> StackSampler:
+    """seconds 동안 프로세스 전체를 샘플링합니다 (이벤트 루프는 블로킹하지 않음)"""
+    sampler = StackSampler(interval=interval).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    return sampler
+
+
+# 요청 단위 프로파일 결과 (최근 MAX_REQUEST_PROFILES 개만 보관)
+MAX_REQUEST_PROFILES = 32
+REQUEST_PROFILE_LINES = 40  # 저장할 함수 통계 줄 수 (누적 시간 순)
+request_profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def save_request_profile(
+    profile_id: str, method: str, path: str, profile: cProfile.Profile, elapsed: float, other_tasks: int
+) -> None:
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(REQUEST_PROFILE_LINES)
+    request_profiles[profile_id] = {
+        "method": method,
+        "path": path,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        # cProfile 은 이벤트 루프 스레드 전체를 기록하므로, 이 요청이 await 하는 동안 실행된
+        # 다른 요청/타이머 휠 태스크의 함수도 통계에 포함됨
+        "scope": "event_loop",
+        "other_tasks": other_tasks,  # 프로파일링 시작 시점에 함께 떠 있던 다른 asyncio 태스크 수
+        "stats": out.getvalue(),
+        "created_at": time.time(),
+    }
+    while len(request_profiles) > MAX_REQUEST_PROFILES:
+        request_profiles.popitem(last=False)
+
+
+class RequestProfileMiddleware:
+    """X-Profile: 1 헤더와 관리자 토큰이 있는 HTTP 요청만 cProfile 로 프로파일링하는 ASGI 미들웨어
+
+    1ms 미만의 짧은 요청도 잡을 수 있도록 샘플링 대신 결정적 프로파일러를 사용하며,
+    결과는 응답 헤더 X-Profile-Id 로 연결합니다. 그 외 요청(스트리밍 /mcp 포함)은 헤더만 확인하고 그대로 통과시킵니다.
+    프로파일은 요청이 처리되는 동안의 이벤트 루프 스레드 전체를 담으므로(결과의 scope 가 "event_loop"),
+    같은 시간에 실행된 다른 코루틴도 함께 기록됩니다. 한 번에 한 요청만 프로파일링합니다.
+    """
+
+    def __init__(self, app, is_admin: Callable[[Optional[str]], bool]):
+        self.app = app
+        self.is_admin = is_admin
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            return await self.app(scope, receive, send)
+        profile_flag = token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                profile_flag = value
+            elif name == b"x-admin-token":
+                token = value.decode("latin-1")
+        if profile_flag != b"1" or not self.is_admin(token):
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        self._active = True
+        other_tasks = len(asyncio.all_tasks()) - 1
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.disable()
+            self._active = False
+            save_request_profile(
+                profile_id, scope["method"], scope["path"], profile, time.perf_counter() - started, other_tasks
+            )
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class TimerHandle:
+    """타이머 휠에 등록된 타이머 (cancel() 로 취소)"""
+    __slots__ = ("deadline", "callback", "args", "_slot")
+
+    def __init__(self, deadline: int, callback: Callable, args: tuple):
+        self.deadline = deadline  # 만료 틱
+        self.callback = callback
+        self.args = args
+        self._slot: Optional[Dict["TimerHandle", None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+    def cancel(self) -> None:
+        """타이머를 취소합니다 (O(1))"""
+        if self._slot is not None:
+            self._slot.pop(self, None)
+            self._slot = None
+
+
+class TimerWheel:
+    """계층형 타이머 휠
+
+    레벨마다 wheel_size 개의 슬롯이 있고, 레벨 0 슬롯 하나가 틱 하나를 나타냅니다.
+    먼 타이머는 상위 레벨에 넣어두었다가 해당 구간에 들어오면 하위 레벨로 내려보냅니다(cascade).
+    등록/취소는 O(1), 틱 처리는 만료되거나 내려보내는 타이머 수에 비례합니다(상각 O(1)).
+    """
+
+    def __init__(self, tick: float = 0.1, wheel_bits: int = 6, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self.clock = clock
+        self._bits = wheel_bits
+        self._mask = (1 << wheel_bits) - 1
+        self._levels: List[List[Dict[TimerHandle, None]]] = [
+            [{} for _ in range(1 << wheel_bits)] for _ in range(levels)
+        ]
+        self._max_ticks = 1 << (wheel_bits * levels)  # 휠이 직접 표현할 수 있는 최대 틱 간격
+        self._origin = clock()
+        self.current_tick = 0
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """delay 초 뒤에 callback(*args) 를 호출하도록 등록합니다 (O(1))"""
+        ticks = max(1, -int(-delay // self.tick))  # 올림: 예정 시각보다 일찍 실행되지 않도록
+        # current_tick 은 run() 이 advance() 할 때만 갱신되어 실제 시각보다 늦을 수 있으므로(이벤트 루프 지연 등)
+        # 현재 시각을 기준으로 계산 (역시 올림)
+        elapsed_ticks = -int(-(self.clock() - self._origin) // self.tick)
+        handle = TimerHandle(max(self.current_tick, elapsed_ticks) + ticks, callback, args)
+        self._place(handle)
+        return handle
+
+    def _place(self, handle: TimerHandle) -> None:
+        # 휠 범위를 넘는 타이머는 최상위 레벨의 가장 먼 슬롯에 두었다가 cascade 때 다시 배치
+        deadline = min(handle.deadline, self.current_tick + self._max_ticks - 1)
+        diff = deadline - self.current_tick
+        for level, slots in enumerate(self._levels):
+            if diff < 1 << (self._bits * (level + 1)):
+                slot = slots[(deadline >> (self._bits * level)) & self._mask]
+                slot[handle] = None
+                handle._slot = slot
+                return
+
+    def _advance_one(self) -> List[TimerHandle]:
+        self.current_tick += 1
+        tick = self.current_tick
+
+        # 상위 레벨 경계에 도달했으면 해당 슬롯의 타이머를 하위 레벨로 내려보냄 (높은 레벨부터)
+        boundary = 0
+        while boundary + 1 < len(self._levels) and tick & ((1 << (self._bits * (boundary + 1))) - 1) == 0:
+            boundary += 1
+        for level in range(boundary, 0, -1):
+            slots = self._levels[level]
+            index = (tick >> (self._bits * level)) & self._mask
+            cascading, slots[index] = slots[index], {}
+            for handle in cascading:
+                self._place(handle)
+
+        slots = self._levels[0]
+        index = tick & self._mask
+        expired, slots[index] = slots[index], {}
+        for handle in expired:
+            handle._slot = None
+        return list(expired)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """now 까지 틱을 진행하며 만료된 타이머를 실행하고, 실행한 타이머 수를 반환합니다"""
+        now = self.clock() if now is None else now
+        target = int((now - self._origin) / self.tick)
+        fired = 0
+        while self.current_tick < target:
+            for handle in self._advance_one():
+                fired += 1
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    print(f"타이머 콜백 실패: {e}")
+        return fired
+
+    async def run(self) -> None:
+        """틱마다 휠을 진행시키는 스케줄러 태스크 (휠 하나당 하나만 실행)"""
+        while True:
+            await asyncio.sleep(self.tick)
+            self.advance()
+
+
+if __name__ == "__main__":
+    # 벤치마크: 룸 100,000개의 라운드 타이머 + 점유 타이머를 하나의 휠로 처리
+    import random
+
+    rooms = 100_000
+    fake_now = [0.0]
+    wheel = TimerWheel(tick=0.1, clock=lambda: fake_now[0])
+    rng = random.Random(0)
+
+    cpu = time.process_time()
+    round_timers = [wheel.call_later(rng.uniform(30, 300), lambda: None) for _ in range(rooms)]
+    claim_timers = [wheel.call_later(rng.uniform(5, 60), lambda: None) for _ in range(rooms)]
+    schedule_cpu = time.process_time() - cpu
+    print(f"schedule {2 * rooms:,} timers: {schedule_cpu * 1e3:.1f} ms CPU "
+          f"({schedule_cpu / (2 * rooms) * 1e9:.0f} ns/timer)")
+
+    cpu = time.process_time()
+    for handle in claim_timers[: rooms // 2]:
+        handle.cancel()
+    cancel_cpu = time.process_time() - cpu
+    print(f"cancel {rooms // 2:,} timers: {cancel_cpu * 1e3:.1f} ms CPU")
+
+    # 게임 시간 10분을 100ms 틱으로 진행 (6,000 틱)
+    simulated = 600.0
+    cpu = time.process_time()
+    fired = 0
+    while fake_now[0] < simulated:
+        fake_now[0] += wheel.tick
+        fired += wheel.advance()
+    advance_cpu = time.process_time() - cpu
+    print(f"advance {simulated:.0f}s of game time: fired {fired:,} timers, {advance_cpu * 1e3:.1f} ms CPU "
+          f"({advance_cpu / simulated * 100:.3f}% of one core)")
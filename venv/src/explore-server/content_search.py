@@ -0,0 +1,196 @@
+#explorer-server/content_search.py
+# 파일 내용 검색 (grep_files 도구에서 사용)
+# - 파일은 mmap 으로 열어 정규식 검색 (줄번호 계산용으로 일치 위치 사이 구간과 결과로 돌려줄 줄만 복사)
+# - 정규식은 줄 단위로 동작하도록 MULTILINE 으로 컴파일하고, 결과에는 일치가 시작된 줄을 담음
+# - 앞부분에 NUL 바이트가 있는 파일은 바이너리로 보고 건너뜀
+# - 여러 파일을 묶은 작업 단위로 프로세스 풀에 분산하고, 결과가 max_results 에 도달하면 남은 작업을 취소
+# 워커 프로세스가 가볍게 뜰 수 있도록 MCP 관련 모듈은 import 하지 않음
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+BINARY_SNIFF_BYTES = 8192  # 바이너리 판별에 사용할 앞부분 크기
+MAX_FILE_SIZE = 100 * 1024 * 1024  # 이보다 큰 파일은 건너뜀
+BATCH_BYTES = 8 * 1024 * 1024  # 작업 하나에 담을 최대 파일 크기 합
+BATCH_FILES = 256  # 작업 하나에 담을 최대 파일 수
+MAX_LINE_CHARS = 300  # 결과에 담을 한 줄의 최대 길이
+
+
+def _search_one(path: str, regex: "re.Pattern", max_matches: int) -> Tuple[List[Dict], int]:
+    """파일 하나를 검색하여 (일치 목록, 검사한 바이트 수) 반환"""
+    matches: List[Dict] = []
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > MAX_FILE_SIZE:
+                return matches, 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                    return matches, 0
+                line_no, counted_to = 1, 0
+                for m in regex.finditer(mm):
+                    start = mm.rfind(b"\n", 0, m.start()) + 1
+                    end = mm.find(b"\n", m.start())  # 여러 줄에 걸친 일치는 시작 줄만 보고
+                    if end == -1:
+                        end = size
+                    # 직전 일치 이후 구간만 잘라서 C 수준의 count 로 개행 수를 셈
+                    line_no += mm[counted_to:start].count(b"\n")
+                    counted_to = start
+                    line = mm[start:end].decode("utf-8", errors="replace").strip()
+                    matches.append({"경로": path, "줄번호": line_no, "내용": line[:MAX_LINE_CHARS]})
+                    if len(matches) >= max_matches:
+                        break
+                return matches, size
+    except (OSError, ValueError):
+        return matches, 0
+
+
+def search_batch(paths: List[str], pattern: bytes, flags: int, max_matches: int) -> Tuple[List[Dict], int]:
+    """워커 프로세스에서 실행: 파일 묶음을 검색하여 (일치 목록, 검사한 바이트 수) 반환"""
+    regex = re.compile(pattern, flags)
+    matches: List[Dict] = []
+    scanned = 0
+    for path in paths:
+        found, size = _search_one(path, regex, max_matches - len(matches))
+        matches.extend(found)
+        scanned += size
+        if len(matches) >= max_matches:
+            break
+    return matches, scanned
+
+
+def _batches(paths: Iterable[str]) -> Iterator[List[str]]:
+    batch: List[str] = []
+    batch_bytes = 0
+    for path in paths:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            continue
+        if size == 0 or size > MAX_FILE_SIZE:
+            continue
+        batch.append(path)
+        batch_bytes += size
+        if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """검색용 프로세스 풀 (호출마다 새로 띄우지 않도록 재사용)"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+class GrepStats:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / (1024 * 1024) / max(time.perf_counter() - self.started, 1e-9)
+
+
+def grep(
+    paths: Iterable[str],
+    keyword: str,
+    max_results: int = 50,
+    regex: bool = False,
+    ignore_case: bool = True,
+    workers: Optional[int] = None,
+    stats: Optional[GrepStats] = None,
+) -> Iterator[Dict]:
+    """paths 의 파일 내용에서 keyword 를 검색하여 일치하는 줄을 찾는 대로 내보냄 (최대 max_results 개)"""
+    workers = workers or os.cpu_count() or 2
+    pattern = keyword.encode("utf-8") if regex else re.escape(keyword.encode("utf-8"))
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)  # ^/$ 가 각 줄의 시작/끝에 일치하도록
+    re.compile(pattern, flags)  # 잘못된 정규식은 워커에 보내기 전에 여기서 오류 발생
+    stats = stats or GrepStats()
+
+    pool = _get_pool(workers)
+    batches = _batches(paths)
+    in_flight = {}
+    emitted = 0
+
+    def submit_more() -> None:
+        while len(in_flight) < workers * 2:
+            batch = next(batches, None)
+            if batch is None:
+                return
+            in_flight[pool.submit(search_batch, batch, pattern, flags, max_results)] = len(batch)
+
+    try:
+        submit_more()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stats.files += in_flight.pop(future)
+                matches, scanned = future.result()
+                stats.bytes += scanned
+                for match in matches:
+                    yield match
+                    emitted += 1
+                    if emitted >= max_results:
+                        return
+            submit_more()
+    finally:
+        # 조기 종료(결과 충분, 호출자 중단) 시 아직 시작하지 않은 작업은 취소
+        for future in in_flight:
+            future.cancel()
+
+
+def _benchmark() -> None:
+    """합성 디렉터리 트리에서 워커 수별 검색 처리량(MB/s) 측정"""
+    import random
+    import string
+    import tempfile
+
+    rng = random.Random(0)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(5000)]
+    with tempfile.TemporaryDirectory() as root:
+        paths = []
+        for d in range(40):
+            dirpath = os.path.join(root, f"dir{d}")
+            os.makedirs(dirpath)
+            for i in range(50):
+                path = os.path.join(dirpath, f"file{i}.txt")
+                with open(path, "w") as f:
+                    for _ in range(2000):
+                        f.write(" ".join(rng.choices(words, k=12)) + "\n")
+                paths.append(path)
+            with open(os.path.join(dirpath, "blob.bin"), "wb") as f:
+                f.write(os.urandom(256 * 1024) + b"\0")
+            paths.append(os.path.join(dirpath, "blob.bin"))
+        total_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+        print(f"synthetic tree: {len(paths)} files, {total_mb:.1f} MB")
+
+        for workers in sorted({1, 2, 4, os.cpu_count() or 4}):
+            list(grep(paths[: workers * 2], "warmup", workers=workers))  # 워커 프로세스 기동 시간은 측정에서 제외
+            stats = GrepStats()
+            found = sum(1 for _ in grep(paths, "needle-not-present", max_results=10, workers=workers, stats=stats))
+            print(f"workers={workers:2d}: {stats.mb_per_s:8.1f} MB/s ({stats.files} files, {found} matches, full scan)")
+
+        stats = GrepStats()
+        found = sum(1 for _ in grep(paths, words[0], max_results=10, stats=stats))
+        print(f"early stop: {found} matches after {stats.bytes / (1024 * 1024):.1f} MB scanned")
+
+
+if __name__ == "__main__":
+    _benchmark()
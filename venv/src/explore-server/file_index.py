@@ -0,0 +1,411 @@
+#explorer-server/file_index.py
+# 파일명 검색용 영구 인덱스
+# - 파일명(소문자)의 3글자 조각(trigram) → 파일 ID 집합으로 역색인을 만들어 키워드 검색을 밀리초 단위로 처리
+# - 최초 구축은 여러 스레드에서 os.scandir 로 디렉터리를 병렬 순회
+# - Linux 에서는 inotify 로 변경을 즉시 반영하고, 그 외(또는 watch 한도 초과 시)에는 디렉터리 mtime 재검사로 갱신
+# - 인덱스는 pickle 로 디스크에 저장되어 재시작 시 바로 사용 가능
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+INDEX_FORMAT_VERSION = 1
+_EMPTY: Set[int] = frozenset()
+
+
+def _trigrams(name: str) -> Set[str]:
+    s = name.lower()
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class _Inotify:
+    """libc 의 inotify 를 ctypes 로 감싼 최소 구현 (Linux 전용)"""
+
+    IN_MODIFY_MASK = (
+        0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+        | 0x00000400  # IN_DELETE_SELF
+        | 0x00000800  # IN_MOVE_SELF
+        | 0x01000000  # IN_ONLYDIR
+    )
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    _EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.IN_MODIFY_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> Iterable[tuple]:
+        """이벤트가 올 때까지 블로킹한 뒤 (wd, mask) 목록을 반환"""
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, name_len = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size + name_len
+            yield wd, mask
+
+
+class FileIndex:
+    """ROOT_DIR 아래 파일명의 trigram 인덱스"""
+
+    def __init__(
+        self,
+        root: str,
+        index_path: str,
+        is_excluded: Callable[[str], bool],
+        workers: int = 16,
+        rescan_interval: float = 60.0,
+    ):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.index_path = index_path
+        self._is_excluded = is_excluded
+        self.workers = workers
+        self.rescan_interval = rescan_interval
+        self.ready = threading.Event()  # 인덱스가 검색에 사용 가능한 상태인지
+
+        self._lock = threading.RLock()
+        self._names: List[Optional[str]] = []  # 파일 ID → 파일명 (삭제된 ID 는 None)
+        self._dirs: List[Optional[str]] = []  # 파일 ID → 디렉터리 경로
+        self._free: List[int] = []  # 재사용 가능한 파일 ID
+        self._dir_files: Dict[str, Dict[str, int]] = {}  # 디렉터리 → {파일명: 파일 ID}
+        self._children: Dict[str, Set[str]] = {}  # 디렉터리 → 하위 디렉터리
+        self._dir_mtime: Dict[str, float] = {}  # 디렉터리 → 마지막으로 읽었을 때의 mtime
+        self._trigrams: Dict[str, Set[int]] = {}  # trigram → 파일 ID 집합
+        self._dirty = False
+
+        self._inotify: Optional[_Inotify] = None
+        self._inotify_complete = False  # 모든 디렉터리에 watch 가 걸려 있는지
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        self._watch_lock = threading.Lock()
+
+    # ---- 검색 ----
+    def search(self, keyword: str, base_path: str, max_results: int) -> List[str]:
+        """파일명에 keyword 가 포함된(대소문자 무시) base_path 아래 파일 경로 목록"""
+        kw = keyword.lower()
+        base = os.path.abspath(os.path.expanduser(base_path))
+        prefix = base.rstrip(os.sep) + os.sep
+        results: List[str] = []
+        with self._lock:
+            if len(kw) >= 3:
+                postings = sorted((self._trigrams.get(t, _EMPTY) for t in _trigrams(kw)), key=len)
+                ids: Iterable[int] = sorted(postings[0].intersection(*postings[1:]))
+            else:
+                ids = range(len(self._names))  # 2글자 이하는 trigram 이 없으므로 메모리 내 전체 스캔
+            for i in ids:
+                name = self._names[i]
+                if name is None or kw not in name.lower():
+                    continue
+                dirpath = self._dirs[i]
+                if dirpath != base and not dirpath.startswith(prefix):
+                    continue
+                results.append(os.path.join(dirpath, name))
+                if len(results) >= max_results:
+                    break
+        return results
+
+    def paths(self, base_path: str) -> List[str]:
+        """base_path 아래 인덱스된 모든 파일 경로"""
+        base = os.path.abspath(os.path.expanduser(base_path))
+        prefix = base.rstrip(os.sep) + os.sep
+        with self._lock:
+            return [
+                os.path.join(dirpath, name)
+                for dirpath, files in self._dir_files.items()
+                if dirpath == base or dirpath.startswith(prefix)
+                for name in files
+            ]
+
+    def covers(self, base_path: str) -> bool:
+        """base_path 가 인덱스 범위(root 아래)인지"""
+        base = os.path.abspath(os.path.expanduser(base_path))
+        return base == self.root or base.startswith(self.root.rstrip(os.sep) + os.sep)
+
+    # ---- 인덱스 갱신 (self._lock 을 잡은 상태에서 호출) ----
+    def _add_file(self, dirpath: str, name: str) -> None:
+        if self._free:
+            file_id = self._free.pop()
+            self._names[file_id] = name
+            self._dirs[file_id] = dirpath
+        else:
+            file_id = len(self._names)
+            self._names.append(name)
+            self._dirs.append(dirpath)
+        self._dir_files.setdefault(dirpath, {})[name] = file_id
+        for t in _trigrams(name):
+            self._trigrams.setdefault(t, set()).add(file_id)
+
+    def _remove_file(self, file_id: int) -> None:
+        name = self._names[file_id]
+        for t in _trigrams(name):
+            ids = self._trigrams.get(t)
+            if ids is not None:
+                ids.discard(file_id)
+                if not ids:
+                    del self._trigrams[t]
+        self._names[file_id] = None
+        self._dirs[file_id] = None
+        self._free.append(file_id)
+
+    def _remove_dir(self, dirpath: str) -> None:
+        for child in self._children.pop(dirpath, ()):
+            self._remove_dir(child)
+        for file_id in self._dir_files.pop(dirpath, {}).values():
+            self._remove_file(file_id)
+        self._dir_mtime.pop(dirpath, None)
+        self._unwatch(dirpath)
+        self._dirty = True
+
+    def _apply_listing(self, dirpath: str, mtime: float, files: List[str], subdirs: List[str]) -> List[str]:
+        """디렉터리 한 개의 목록을 인덱스에 반영하고, 새로 생긴 하위 디렉터리 목록을 반환"""
+        known = self._dir_files.setdefault(dirpath, {})
+        current = set(files)
+        for name in [n for n in known if n not in current]:
+            self._remove_file(known.pop(name))
+        for name in current.difference(known):
+            self._add_file(dirpath, name)
+
+        subdirs = [d for d in subdirs if not self._is_excluded(d)]
+        old_children = self._children.get(dirpath, set())
+        new_children = set(subdirs)
+        for gone in old_children - new_children:
+            self._remove_dir(gone)
+        self._children[dirpath] = new_children
+        self._dir_mtime[dirpath] = mtime
+        self._dirty = True
+        return [d for d in subdirs if d not in old_children]
+
+    # ---- 디렉터리 순회 ----
+    def _scan_dir(self, dirpath: str):
+        """디렉터리 한 개를 읽음 (워커 스레드에서 실행, 인덱스는 건드리지 않음)"""
+        self._watch(dirpath)  # 목록을 읽기 전에 watch 를 걸어야 그 사이의 변경을 놓치지 않음
+        try:
+            mtime = os.stat(dirpath).st_mtime
+            files, subdirs = [], []
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        # os.walk(followlinks=False) 와 동일: 디렉터리 심볼릭 링크는 파일로도, 하위 디렉터리로도 취급하지 않음
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+            return dirpath, mtime, files, subdirs
+        except OSError as e:
+            logging.debug(f"디렉터리 접근 오류: {dirpath} - {e}")
+            return None
+
+    def _crawl(self, roots: List[str]) -> None:
+        """roots 부터 하위 디렉터리를 여러 스레드에서 병렬로 순회하여 인덱스에 반영"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, d) for d in roots if not self._is_excluded(d)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    with self._lock:
+                        new_dirs = self._apply_listing(*result)
+                    pending.update(pool.submit(self._scan_dir, d) for d in new_dirs)
+
+    def _refresh_dir(self, dirpath: str) -> None:
+        """디렉터리 한 개를 다시 읽어 반영하고, 새 하위 디렉터리는 전체 순회"""
+        result = self._scan_dir(dirpath)
+        with self._lock:
+            if result is None:
+                self._remove_dir(dirpath)
+                return
+            new_dirs = self._apply_listing(*result)
+        if new_dirs:
+            self._crawl(new_dirs)
+
+    def _rescan_changed(self) -> None:
+        """mtime 이 바뀐 디렉터리만 다시 읽음 (inotify 를 쓸 수 없을 때의 대체 수단)"""
+        with self._lock:
+            snapshot = list(self._dir_mtime.items())
+        for dirpath, mtime in snapshot:
+            try:
+                changed = os.stat(dirpath).st_mtime != mtime
+            except OSError:
+                changed = True
+            if changed:
+                self._refresh_dir(dirpath)
+
+    # ---- inotify ----
+    def _watch(self, dirpath: str) -> None:
+        if self._inotify is None:
+            return
+        with self._watch_lock:
+            if dirpath in self._dir_to_wd:
+                return
+            try:
+                wd = self._inotify.add_watch(dirpath)
+            except OSError as e:
+                # fs.inotify.max_user_watches 한도 초과: 이후로는 mtime 재검사로 보완
+                if e.errno in (errno.ENOSPC, errno.ENOMEM):
+                    if self._inotify_complete:
+                        logging.warning(f"inotify watch 추가 실패, mtime 재검사로 전환: {e}")
+                    self._inotify_complete = False
+                return
+            self._wd_to_dir[wd] = dirpath
+            self._dir_to_wd[dirpath] = wd
+
+    def _unwatch(self, dirpath: str) -> None:
+        if self._inotify is None:
+            return
+        with self._watch_lock:
+            wd = self._dir_to_wd.pop(dirpath, None)
+            if wd is not None:
+                self._wd_to_dir.pop(wd, None)
+                self._inotify.rm_watch(wd)
+
+    def _start_inotify(self) -> None:
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            self._inotify = _Inotify()
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify 를 사용할 수 없어 mtime 재검사만 사용합니다: {e}")
+            return
+        self._inotify_complete = True
+        threading.Thread(target=self._inotify_loop, name="file-index-inotify", daemon=True).start()
+
+    def _inotify_loop(self) -> None:
+        while True:
+            try:
+                events = list(self._inotify.read_events())
+            except OSError as e:
+                logging.warning(f"inotify 읽기 실패: {e}")
+                time.sleep(1.0)
+                continue
+            # 한 번에 읽은 이벤트를 디렉터리 단위로 모아서 디렉터리당 한 번만 다시 읽음
+            changed: Set[str] = set()
+            overflow = False
+            for wd, mask in events:
+                if mask & _Inotify.IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                with self._watch_lock:
+                    dirpath = self._wd_to_dir.get(wd)
+                    if mask & _Inotify.IN_IGNORED and dirpath is not None:
+                        del self._wd_to_dir[wd]
+                        self._dir_to_wd.pop(dirpath, None)
+                if dirpath is not None:
+                    changed.add(dirpath)
+            try:
+                if overflow:
+                    self._rescan_changed()
+                for dirpath in changed:
+                    self._refresh_dir(dirpath)
+            except Exception as e:
+                logging.warning(f"인덱스 갱신 실패: {e}")
+
+    # ---- 저장/로드 ----
+    def save(self) -> None:
+        with self._lock:
+            state = {
+                "version": INDEX_FORMAT_VERSION,
+                "root": self.root,
+                "names": self._names,
+                "dirs": self._dirs,
+                "free": self._free,
+                "children": self._children,
+                "dir_mtime": self._dir_mtime,
+                "trigrams": self._trigrams,
+            }
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.index_path)
+
+    def _load(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logging.info(f"저장된 파일 인덱스 없음, 새로 구축합니다: {e}")
+            return False
+        if state.get("version") != INDEX_FORMAT_VERSION or state.get("root") != self.root:
+            return False
+        with self._lock:
+            self._names = state["names"]
+            self._dirs = state["dirs"]
+            self._free = state["free"]
+            self._children = state["children"]
+            self._dir_mtime = state["dir_mtime"]
+            self._trigrams = state["trigrams"]
+            self._dir_files = {}
+            for file_id, (dirpath, name) in enumerate(zip(self._dirs, self._names)):
+                if name is not None:
+                    self._dir_files.setdefault(dirpath, {})[name] = file_id
+            for dirpath in self._dir_mtime:
+                self._dir_files.setdefault(dirpath, {})
+        return True
+
+    # ---- 실행 ----
+    def start(self) -> None:
+        """저장된 인덱스를 불러오고, 백그라운드에서 구축/갱신을 시작"""
+        loaded = self._load()
+        if loaded:
+            self.ready.set()
+        threading.Thread(target=self._run, args=(loaded,), name="file-index", daemon=True).start()
+
+    def _run(self, loaded: bool) -> None:
+        started = time.perf_counter()
+        self._start_inotify()
+        if loaded:
+            # 서버가 꺼져 있던 동안의 변경 반영 (기존 디렉터리에도 watch 를 다시 검)
+            with self._lock:
+                known_dirs = list(self._dir_mtime)
+            for dirpath in known_dirs:
+                self._watch(dirpath)
+            self._rescan_changed()
+        else:
+            self._crawl([self.root])
+            self.ready.set()
+        self.save()
+        logging.info(
+            f"파일 인덱스 준비 완료: {sum(n is not None for n in self._names)}개 파일, "
+            f"{len(self._dir_mtime)}개 디렉터리 ({time.perf_counter() - started:.1f}s)"
+        )
+
+        while True:
+            # inotify 가 모든 디렉터리를 감시 중이면 재검사는 안전장치로 드물게만 수행
+            time.sleep(self.rescan_interval * (10 if self._inotify_complete else 1))
+            try:
+                self._rescan_changed()
+                if self._dirty:
+                    self.save()
+            except Exception as e:
+                logging.warning(f"파일 인덱스 재검사 실패: {e}")
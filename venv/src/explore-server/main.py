@@ -0,0 +1,197 @@
+#explorer-server/main.py
+import os
+import logging
+from datetime import datetime
+import subprocess
+from typing import List, Dict, Optional
+
+import content_search  # mmap + 프로세스 풀 기반 파일 내용 검색 (같은 디렉터리)
+
+# grep_files 의 spawn 워커는 이 스크립트를 __mp_main__ 으로 다시 import 한다.
+# 워커에는 content_search 만 필요하므로 MCP 서버, 로깅 설정, 파일명 인덱스는 메인 프로세스에서만 만든다.
+IS_WORKER = __name__ == "__mp_main__"
+
+if not IS_WORKER:
+    from mcp.server.fastmcp import FastMCP
+    from file_index import FileIndex  # 파일명 trigram 인덱스 (같은 디렉터리)
+
+    logging.basicConfig(level=logging.INFO)
+
+    # MCP 서버 인스턴스
+    mcp = FastMCP("File-Search")
+
+# ---- macOS용 기본 설정 ----
+# 기본 루트: 사용자 홈 디렉터리. 필요 시 환경변수 FILE_SEARCH_ROOT 로 재정의 가능.
+ROOT_DIR = os.path.expanduser(os.environ.get("FILE_SEARCH_ROOT", "~"))
+
+# 숨김 디렉터리/시스템 경로 등 제외하고 싶으면 여기에 패턴 추가
+EXCLUDE_DIR_NAMES = {".git", ".Trash", ".Spotlight-V100", ".fseventsd", ".DS_Store", "node_modules"}
+EXCLUDE_PATH_PREFIXES = [
+    os.path.expanduser("~/Library/Caches"),
+    os.path.expanduser("~/Library/Containers/com.apple.Safari/Data"),
+]
+
+# 파일명 인덱스 저장 위치 (환경변수 FILE_INDEX_PATH 로 재정의 가능)
+INDEX_PATH = os.path.expanduser(os.environ.get("FILE_INDEX_PATH", "~/.cache/explore-server/file_index.pickle"))
+# 인덱스 파일 자체의 저장이 변경 감지를 다시 일으키지 않도록 제외
+EXCLUDE_PATH_PREFIXES.append(os.path.dirname(INDEX_PATH))
+
+def _is_excluded(dirpath: str) -> bool:
+    # 경로 접두어 기반 제외
+    for p in EXCLUDE_PATH_PREFIXES:
+        if dirpath.startswith(p):
+            return True
+    # 폴더명 기반 제외
+    base = os.path.basename(dirpath)
+    if base in EXCLUDE_DIR_NAMES:
+        return True
+    return False
+
+def _fmt_datetime_from_stat(stat) -> str:
+    # macOS: st_birthtime 이 있으면 '생성일', 없으면 수정시간으로 대체
+    ts = getattr(stat, "st_birthtime", None)
+    if ts is None:
+        ts = stat.st_mtime
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+# ROOT_DIR 아래 파일명 인덱스: 시작 시 디스크에서 불러오고 백그라운드에서 구축/갱신
+if not IS_WORKER:
+    file_index = FileIndex(ROOT_DIR, INDEX_PATH, _is_excluded)
+    file_index.start()
+
+def _file_info(fpath: str) -> Dict:
+    stat = os.stat(fpath)
+    return {
+        "파일명": os.path.basename(fpath),
+        "경로": fpath,
+        "크기(Bytes)": stat.st_size,
+        "생성일": _fmt_datetime_from_stat(stat),
+    }
+
+# 파일 검색
+def search_files(keyword: str, base_path: str = ROOT_DIR, max_results: int = 20) -> List[Dict]:
+    results: List[Dict] = []
+    base_path = os.path.expanduser(base_path)
+
+    # 인덱스가 준비되어 있고 검색 범위가 ROOT_DIR 아래면 인덱스에서 바로 조회
+    if file_index.ready.is_set() and file_index.covers(base_path):
+        # 인덱스 반영 전에 삭제된 파일이 있을 수 있으므로 여유 있게 조회
+        for fpath in file_index.search(keyword, base_path, max_results * 2):
+            try:
+                results.append(_file_info(fpath))
+            except OSError as e:
+                logging.warning(f"파일 접근 오류: {fpath} - {e}")
+                continue
+            if len(results) >= max_results:
+                break
+        return results
+
+    for dirpath, dirnames, filenames in os.walk(base_path, followlinks=False):
+        # 제외 디렉터리 필터링
+        if _is_excluded(dirpath):
+            # 하위 순회를 막기 위해 dirnames를 비워버림
+            dirnames[:] = []
+            continue
+
+        # 숨김 폴더 대량 순회 방지: 필요 시 아래 주석 해제
+        # dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+        for fname in filenames:
+            try:
+                if keyword.lower() in fname.lower():
+                    results.append(_file_info(os.path.join(dirpath, fname)))
+                    if len(results) >= max_results:
+                        return results
+            except Exception as e:
+                logging.warning(f"파일 접근 오류: {os.path.join(dirpath, fname)} - {e}")
+                continue
+
+    return results
+
+def find_file(keyword: str, base_path: Optional[str] = None, max_results: int = 20) -> str:
+    """
+    macOS에서 파일명을 기준으로 키워드에 해당하는 파일을 검색합니다.
+    - keyword: 포함 검색(대소문자 무시)
+    - base_path: 검색 시작 경로(기본값: 사용자 홈). 환경변수 FILE_SEARCH_ROOT로도 설정 가능
+    - max_results: 최대 결과 개수
+    """
+    root = base_path or ROOT_DIR
+    logging.info(f"🔍 '{keyword}' 키워드로 파일 검색 시작 (root={root}, max={max_results})")
+
+    found = search_files(keyword, base_path=root, max_results=max_results)
+    if not found:
+        return f"'{keyword}'에 해당하는 파일을 찾을 수 없습니다. (검색 루트: {os.path.expanduser(root)})"
+
+    lines = [
+        f"📄 {f['파일명']} ({f['크기(Bytes)']} Bytes) - {f['경로']} - 생성일 {f['생성일']}"
+        for f in found
+    ]
+    return "\\n".join(lines)
+
+def _walk_files(base_path: str):
+    """os.walk 로 base_path 아래 파일 경로를 차례로 생성 (_is_excluded 규칙 적용)"""
+    for dirpath, dirnames, filenames in os.walk(base_path, followlinks=False):
+        if _is_excluded(dirpath):
+            dirnames[:] = []
+            continue
+        for fname in filenames:
+            yield os.path.join(dirpath, fname)
+
+def grep_files(pattern: str, base_path: Optional[str] = None, max_results: int = 50, regex: bool = False) -> str:
+    """
+    파일 내용에서 문자열(또는 정규식)을 검색합니다. 바이너리 파일은 건너뜁니다.
+    - pattern: 검색할 문자열(대소문자 무시). regex=True 이면 정규식으로 해석 (^, $ 는 각 줄의 시작/끝)
+    - base_path: 검색 시작 경로(기본값: 사용자 홈). 환경변수 FILE_SEARCH_ROOT로도 설정 가능
+    - max_results: 최대 결과 개수 (도달하면 나머지 검색은 취소)
+    결과는 스트리밍되지 않고, 검색이 끝나거나 max_results 에 도달했을 때 한 번에 반환됩니다.
+    """
+    root = os.path.expanduser(base_path or ROOT_DIR)
+    logging.info(f"🔎 '{pattern}' 내용 검색 시작 (root={root}, max={max_results})")
+
+    # 파일명 인덱스가 준비되어 있으면 디렉터리 순회 없이 파일 목록을 가져옴
+    if file_index.ready.is_set() and file_index.covers(root):
+        paths = file_index.paths(root)
+    else:
+        paths = _walk_files(root)
+
+    stats = content_search.GrepStats()
+    try:
+        found = list(content_search.grep(paths, pattern, max_results=max_results, regex=regex, stats=stats))
+    except Exception as e:
+        return f"오류 발생: {e}"
+    logging.info(f"내용 검색 완료: {stats.files}개 파일, {stats.bytes / (1024 * 1024):.1f} MB ({stats.mb_per_s:.1f} MB/s)")
+
+    if not found:
+        return f"'{pattern}'을(를) 포함한 파일을 찾을 수 없습니다. (검색 루트: {root})"
+    lines = [f"📄 {m['경로']}:{m['줄번호']}: {m['내용']}" for m in found]
+    return "\n".join(lines)
+
+def reveal_in_finder(path: str) -> str:
+    """
+    지정한 파일/폴더를 Finder에서 표시합니다.
+    - 파일이면 해당 파일을 선택 상태로 열고, 폴더면 폴더를 엽니다.
+    """
+    try:
+        target = os.path.expanduser(path)
+        if not os.path.exists(target):
+            return f"경로가 존재하지 않습니다: {target}"
+
+        # 파일이면 -R(=reveal) 옵션으로 표시, 폴더면 그냥 open
+        if os.path.isfile(target):
+            subprocess.run(["open", "-R", target], check=True)
+        else:
+            subprocess.run(["open", target], check=True)
+        return f"Finder에서 표시했습니다: {target}"
+    except subprocess.CalledProcessError as e:
+        return f"Finder 열기 실패: {e}"
+    except Exception as e:
+        return f"오류 발생: {e}"
+
+# MCP 도구 등록 (워커 프로세스에는 MCP 서버가 없음)
+if not IS_WORKER:
+    for tool in (find_file, grep_files, reveal_in_finder):
+        mcp.tool()(tool)
+
+if __name__ == "__main__":
+    # stdio 기반으로 MCP 서버 실행 (Cursor/Claude Desktop/Smithery 등과 연동)
+    mcp.run(transport="stdio")
\ No newline at end of file
@@ -0,0 +1,212 @@
+#math-server/math-server.py
+# 로깅 기능을 위한 모듈 가져오기
+import logging
+
+# 수식 파싱(ast), 컴파일된 수식 캐시(lru_cache), 배열 연산(numpy)을 위한 모듈 가져오기
+import ast
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+# FastMCP 서버를 사용하기 위한 클래스 가져오기
+from mcp.server.fastmcp import FastMCP
+
+# 로깅 설정: INFO 레벨 이상의 로그를 출력
+logging.basicConfig(level=logging.INFO)
+
+# MCP 서버 인스턴스 생성 ("Math"는 이 MCP의 이름 역할)
+mcp = FastMCP("Math")
+
+# 도구 1: 더하기 함수
+@mcp.tool()
+def add(a, b) -> int:
+    """더하기"""
+    try:
+        a = int(a)  # 입력값을 정수로 변환
+        b = int(b)
+        logging.info(f"Adding {a} and {b}")  # 로그 출력
+        return a + b  # 더한 결과 반환
+    except Exception as e:
+        # 예외 발생 시 에러 로그 출력 후 다시 예외 발생시킴
+        logging.error(f"Invalid input in add: {a}, {b} - {e}")
+        raise
+
+# 도구 2: 빼기 함수
+@mcp.tool()
+def Subtract(a, b) -> int:
+    """빼기"""
+    try:
+        a = int(a)  # 입력값을 정수로 변환
+        b = int(b)
+        logging.info(f"Subtracting {a} and {b}")  # 로그 출력
+        return a - b  # 뺀 결과 반환
+    except Exception as e:
+        # 예외 발생 시 에러 로그 출력 후 다시 예외 발생시킴
+        logging.error(f"Invalid input in subtract: {a}, {b} - {e}")
+        raise
+
+# ---- 배열 연산 도구: 한 번의 호출로 여러 값을 처리 ----
+
+# 원소별 연산 (b 가 숫자 하나면 모든 원소에 동일하게 적용)
+ELEMENTWISE_OPS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.true_divide,
+    "floor_divide": np.floor_divide,
+    "mod": np.mod,
+    "power": np.power,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+}
+
+# 배열 하나를 값 하나로 줄이는 연산
+REDUCE_OPS = {
+    "sum": np.sum,
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+    "prod": np.prod,
+    "std": np.std,
+    "median": np.median,
+}
+
+def _as_array(values) -> np.ndarray:
+    # 문자열로 들어온 숫자도 허용 (기존 도구의 int() 변환과 같은 취지)
+    return np.asarray(values, dtype=np.float64)
+
+# 도구 3: 배열 원소별 연산
+@mcp.tool()
+def batch_elementwise(op: str, a: List[float], b: Union[List[float], float]) -> List[float]:
+    """배열 원소별 연산 (op: add, subtract, multiply, divide, floor_divide, mod, power, minimum, maximum)"""
+    func = ELEMENTWISE_OPS.get(op)
+    if func is None:
+        raise ValueError(f"지원하지 않는 연산: {op} (가능: {', '.join(ELEMENTWISE_OPS)})")
+    x, y = _as_array(a), _as_array(b)
+    if y.ndim and x.shape != y.shape:
+        raise ValueError(f"배열 길이가 다릅니다: {x.shape[0]} != {y.shape[0]}")
+    logging.debug(f"batch_elementwise {op} on {x.size} values")
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return func(x, y).tolist()
+
+# 도구 4: 배열 집계 연산
+@mcp.tool()
+def batch_reduce(op: str, values: List[float]) -> float:
+    """배열 집계 (op: sum, mean, min, max, prod, std, median)"""
+    func = REDUCE_OPS.get(op)
+    if func is None:
+        raise ValueError(f"지원하지 않는 연산: {op} (가능: {', '.join(REDUCE_OPS)})")
+    x = _as_array(values)
+    if x.size == 0 and op not in ("sum", "prod"):
+        raise ValueError(f"빈 배열에는 {op} 를 적용할 수 없습니다")
+    logging.debug(f"batch_reduce {op} on {x.size} values")
+    return float(func(x))
+
+# ---- 수식 평가 도구: 수식을 한 번 컴파일해 캐시하고, 변수 배열 전체에 대해 한 번에 계산 ----
+
+# 수식에서 사용할 수 있는 함수/상수 (모두 numpy 함수라 배열에 원소별로 적용됨)
+EXPR_FUNCTIONS = {
+    "abs": np.abs, "sqrt": np.sqrt, "exp": np.exp, "log": np.log, "log10": np.log10,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "floor": np.floor, "ceil": np.ceil,
+    "round": np.round, "min": np.minimum, "max": np.maximum,
+}
+EXPR_CONSTANTS = {"pi": np.pi, "e": np.e}
+# 함수별 인자 수 (min, max 는 두 값의 원소별 비교이며, 더 많은 인자는 numpy 의 out 인자로 넘어가므로 거부)
+EXPR_ARITY = {"round": (1, 2), "min": (2, 2), "max": (2, 2)}
+
+_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_ALLOWED_UNARYOPS = (ast.UAdd, ast.USub)
+
+class _ExpressionChecker(ast.NodeTransformer):
+    """산술 연산/숫자/변수/허용된 함수 호출만 남기고 나머지 구문은 거부"""
+
+    def __init__(self):
+        self.variables = set()
+
+    def generic_visit(self, node):
+        raise ValueError(f"허용되지 않는 구문: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _ALLOWED_BINOPS):
+            raise ValueError(f"허용되지 않는 연산자: {type(node.op).__name__}")
+        node.left, node.right = self.visit(node.left), self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _ALLOWED_UNARYOPS):
+            raise ValueError(f"허용되지 않는 연산자: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"숫자가 아닌 상수: {node.value!r}")
+        # 상수도 numpy float 로 계산: 정수 거듭제곱(9**9**9 등)으로 멈추지 않고, 오버플로는 inf 가 됨
+        call = ast.Call(func=ast.Name("__num", ast.Load()), args=[ast.Constant(float(node.value))], keywords=[])
+        return ast.copy_location(call, node)
+
+    def visit_Name(self, node):
+        if node.id.startswith("__"):
+            raise ValueError(f"허용되지 않는 이름: {node.id}")
+        if node.id not in EXPR_CONSTANTS:
+            self.variables.add(node.id)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in EXPR_FUNCTIONS or node.keywords:
+            raise ValueError(f"허용되지 않는 함수 호출: {ast.unparse(node.func)}")
+        name = node.func.id
+        low, high = EXPR_ARITY.get(name, (1, 1))
+        if not low <= len(node.args) <= high:
+            expected = str(low) if low == high else f"{low}~{high}"
+            raise ValueError(f"{name} 는 인자 {expected}개가 필요합니다 (받은 인자: {len(node.args)}개)")
+        if name == "round" and len(node.args) == 2:
+            # 소수 자릿수는 정수여야 하므로 float 로 바꾸지 않고 정수 리터럴 그대로 둠
+            digits = node.args[1]
+            if isinstance(digits, ast.UnaryOp) and isinstance(digits.op, (ast.UAdd, ast.USub)):
+                digits = digits.operand
+            if not (isinstance(digits, ast.Constant) and type(digits.value) is int):
+                raise ValueError("round 의 두 번째 인자(자릿수)는 정수 리터럴이어야 합니다")
+            node.args = [self.visit(node.args[0]), node.args[1]]
+            return node
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """수식을 검사한 뒤 컴파일 (같은 수식은 캐시된 코드 객체를 재사용)"""
+    tree = ast.parse(expression, mode="eval")
+    checker = _ExpressionChecker()
+    tree = ast.fix_missing_locations(checker.visit(tree))
+    unknown = checker.variables & set(EXPR_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"함수 이름을 변수로 사용할 수 없습니다: {', '.join(sorted(unknown))}")
+    return compile(tree, "<expression>", "eval"), frozenset(checker.variables)
+
+# 도구 5: 수식 평가
+@mcp.tool()
+def evaluate(expression: str, variables: Optional[Dict[str, Union[List[float], float]]] = None) -> Union[List[float], float]:
+    """
+    산술 수식을 계산합니다. 변수에 배열을 주면 모든 원소에 대해 한 번에 계산합니다.
+    - expression: 예) "sqrt(x**2 + y**2) * 2"  (사용 가능한 함수: abs, sqrt, exp, log, log10, sin, cos, tan, floor, ceil, round(x, 자릿수), min(a, b), max(a, b) / 상수: pi, e)
+    - variables: 예) {"x": [3, 6], "y": [4, 8]}
+    """
+    code, names = _compile_expression(expression)
+    variables = variables or {}
+    missing = names - set(variables)
+    if missing:
+        raise ValueError(f"값이 주어지지 않은 변수: {', '.join(sorted(missing))}")
+    namespace = {"__builtins__": {}, "__num": np.float64, **EXPR_FUNCTIONS, **EXPR_CONSTANTS}
+    namespace.update((name, _as_array(variables[name])) for name in names)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        result = np.asarray(eval(code, namespace), dtype=np.float64)
+    return result.tolist()
+
+# 메인 실행 구문: MCP 서버를 stdio 방식으로 실행
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
\ No newline at end of file
@@ -0,0 +1,17 @@
+#rag-server/pdf_ingest.py
+# rag_server.py 의 프로세스 풀에서 실행되는 PDF 파싱 함수들
+# 워커 프로세스가 가볍게 뜰 수 있도록 임베딩/LLM 관련 모듈은 import 하지 않음
+from typing import List, Tuple
+
+from pypdf import PdfReader  # PyPDFLoader 가 내부적으로 사용하는 PDF 파서
+
+
+def page_count(path: str) -> int:
+    """PDF 의 전체 페이지 수"""
+    return len(PdfReader(path).pages)
+
+
+def extract_pages(path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """[start, stop) 범위 페이지의 텍스트를 (페이지 번호, 텍스트) 목록으로 반환"""
+    reader = PdfReader(path)
+    return [(page_no, reader.pages[page_no].extract_text() or "") for page_no in range(start, stop)]
@@ -0,0 +1,460 @@
+import os  # 파일 경로 구성, 디렉토리 탐색 등 운영체제 관련 기능을 사용할 수 있는 표준 모듈
+import asyncio  # 여러 질문의 답변 생성을 동시에 실행하고 stdio 서버가 블로킹되지 않도록 하기 위한 모듈
+import glob  # PDF 디렉토리에서 *.pdf 파일 목록을 찾기 위한 모듈
+import json  # 인덱스 매니페스트(파일 해시 → 페이지 해시 목록)를 디스크에 저장하기 위한 모듈
+import hashlib  # 페이지 내용과 분할/임베딩 설정을 해시하여 재임베딩 여부를 판단하는 데 사용
+import itertools  # 처리 중인 파싱 작업 수를 제한하며 작업을 하나씩 꺼내기 위한 모듈
+import logging  # 프로그램 실행 중의 정보, 경고, 오류 등을 콘솔 또는 로그 파일에 출력하기 위한 모듈
+import multiprocessing  # PDF 파싱 워커 프로세스를 spawn 방식으로 띄우기 위한 모듈
+import threading  # 백그라운드 인덱싱 스레드 실행 및 검색 캐시 접근 직렬화를 위한 모듈
+import time  # 인덱스 로딩/구축 소요 시간을 측정하기 위한 모듈
+from collections import OrderedDict  # 검색/답변 캐시를 LRU 방식으로 관리하기 위한 자료구조
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # PDF 페이지를 여러 프로세스에서 병렬 파싱
+from typing import List
+
+import pdf_ingest  # 워커 프로세스에서 실행되는 PDF 페이지 파싱 함수 (같은 디렉토리)
+
+# spawn 방식의 파싱 워커는 이 스크립트를 __mp_main__ 으로 다시 import 한다.
+# 워커에는 pdf_ingest 만 필요하므로 환경 변수 로드, LangChain/Chroma/MCP import 와 모든 초기화는 메인 프로세스에서만 수행
+IS_WORKER = __name__ == "__mp_main__"
+
+if not IS_WORKER:
+    from dotenv import load_dotenv  # .env 파일에서 환경 변수를 로드하는 모듈
+
+    # 상위 폴더의 .env 파일 로드
+    load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+
+    from mcp.server.fastmcp import FastMCP  # MCP 프로토콜 서버를 간편하게 생성하고 도구를 등록할 수 있는 클래스
+    from langchain_community.vectorstores import Chroma  # 문서 임베딩을 저장하고, 벡터 기반으로 검색할 수 있는 Chroma 벡터 저장소 모듈
+    from langchain_text_splitters import RecursiveCharacterTextSplitter  # 긴 문서를 일정 길이로 나누는 데 사용하는 텍스트 분할 도구
+    from langchain_google_genai import ChatGoogleGenerativeAI  # Google Gemini 언어 모델을 LangChain에서 사용할 수 있게 해주는 래퍼
+    from langchain_huggingface import HuggingFaceEmbeddings  # HuggingFace 임베딩 모델 (무료, 로컬 실행)
+
+    # 로그 출력 수준 설정 (INFO 이상의 로그만 출력됨)
+    logging.basicConfig(level=logging.INFO)
+
+    # MCP 서버 인스턴스 생성 (이름은 "PDF-RAG"으로 설정되며, 로깅 또는 디버깅에 사용됨)
+    mcp = FastMCP("PDF-RAG")
+
+# 분석할 PDF 파일들이 들어있는 디렉토리 (기본값: 현재 스크립트 디렉토리, 환경변수 RAG_PDF_DIR 로 재정의 가능)
+PDF_DIR = os.environ.get("RAG_PDF_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+# 벡터 저장소를 디스크에 영구 저장할 경로 (환경변수 RAG_INDEX_DIR 로 재정의 가능)
+INDEX_DIR = os.environ.get("RAG_INDEX_DIR", os.path.join(os.path.dirname(__file__), "chroma_index"))
+MANIFEST_PATH = os.path.join(INDEX_DIR, "manifest.json")  # PDF 파일 해시와 페이지 해시 목록을 기록하는 파일
+
+# 분할/임베딩 설정 (이 값이 바뀌면 해시가 달라져 모든 페이지가 다시 임베딩됨)
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBED_BATCH_SIZE = 64  # 한 번에 임베딩할 청크 수
+
+# 인덱싱 설정
+INGEST_WORKERS = int(os.environ.get("RAG_INGEST_WORKERS", os.cpu_count() or 2))  # PDF 파싱 프로세스 수
+PAGES_PER_TASK = 8  # 워커 하나가 한 번에 파싱할 페이지 수
+MAX_TASKS_IN_FLIGHT = INGEST_WORKERS * 2  # 동시에 대기시킬 파싱 작업 수 (메모리 사용량 상한)
+PROGRESS_INTERVAL = 5.0  # 진행 상황 로그 출력 간격 (초)
+
+# 질의 설정
+RETRIEVAL_K = 4  # 질문당 검색할 청크 수
+GENERATION_CONCURRENCY = int(os.environ.get("RAG_GENERATION_CONCURRENCY", "4"))  # 동시에 실행할 LLM 호출 수
+CACHE_SIZE = 1024  # 검색/답변 캐시 각각의 최대 항목 수
+
+# 설정 지문: 페이지 해시에 섞어서 설정 변경 시 기존 벡터를 무효화함
+SETTINGS_FINGERPRINT = f"{EMBEDDING_MODEL}|{CHUNK_SIZE}|{CHUNK_OVERLAP}"
+
+if not IS_WORKER:
+    # 페이지 단위 문서를 500자 단위로 잘라서 RAG에 더 적합하게 구성
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)  # 50자씩 겹치게 분할하여 문맥 보존
+
+    # HuggingFace 임베딩 모델을 초기화 (문서 텍스트를 벡터로 변환하는 데 사용됨, 무료 로컬 실행)
+    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+    # Google Gemini 언어 모델을 초기화 (최종 응답을 생성하는 데 사용됨)
+    llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", google_api_key=os.getenv("GEMINI_API_KEY"))
+
+    # 디스크에 영구 저장되는 Chroma 벡터 저장소 (재시작 시 기존 벡터를 그대로 불러옴)
+    vectorstore = Chroma(
+        collection_name="pdf_rag",
+        embedding_function=embeddings,
+        persist_directory=INDEX_DIR,
+    )
+
+
+def _file_sha256(path: str) -> str:
+    """파일 전체 내용의 해시 (PDF가 바뀌지 않았다면 파싱 자체를 건너뛰기 위해 사용)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _page_hash(source: str, content: str) -> str:
+    """페이지 내용 + 분할/임베딩 설정을 묶은 해시 (벡터 ID 의 접두어로 사용)
+
+    페이지 번호는 넣지 않으므로 앞쪽에 페이지가 추가/삭제되어도 뒤 페이지는 다시 임베딩하지 않음
+    (번호는 메타데이터만 갱신). 파일 경로는 넣어서 파일마다 자기 벡터만 관리/삭제하도록 함
+    """
+    h = hashlib.sha256()
+    for part in (SETTINGS_FINGERPRINT, source, content):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest: dict) -> None:
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, MANIFEST_PATH)  # 중간에 종료돼도 매니페스트가 깨지지 않도록 원자적으로 교체
+
+
+# 인덱스 버전: 저장된 페이지 해시 목록의 해시. 인덱스가 바뀌면 캐시 키도 바뀌어 오래된 답변이 재사용되지 않음
+INDEX_VERSION = ""
+
+
+def _index_version(manifest: dict) -> str:
+    h = hashlib.sha256()
+    for source in sorted(manifest):
+        h.update(source.encode("utf-8"))
+        for page_hash in manifest[source].get("pages", []):
+            h.update(page_hash.encode("ascii"))
+    return h.hexdigest()[:16]
+
+
+def _indexed_pages() -> dict:
+    """현재 저장소에 들어있는 벡터를 페이지 해시별로 묶어서 {페이지 해시: {"ids": [...], "meta": 메타데이터}} 로 반환"""
+    stored = vectorstore.get(include=["metadatas"])
+    by_page: dict = {}
+    for vec_id, meta in zip(stored["ids"], stored["metadatas"]):
+        meta = meta or {}
+        by_page.setdefault(meta.get("page_hash"), {"ids": [], "meta": meta})["ids"].append(vec_id)
+    return by_page
+
+
+def _is_complete(entry: dict) -> bool:
+    """페이지의 청크가 모두 저장되어 있는지 (임베딩 배치 사이에 종료되면 일부 청크만 남을 수 있음)"""
+    return len(entry["ids"]) == entry["meta"].get("n_chunks")
+
+
+def _embed_in_batches(chunks) -> None:
+    """청크를 EMBED_BATCH_SIZE 단위로 임베딩하여 저장소에 추가"""
+    for start in range(0, len(chunks), EMBED_BATCH_SIZE):
+        batch = chunks[start:start + EMBED_BATCH_SIZE]
+        vectorstore.add_texts(
+            texts=[text for _, text, _ in batch],
+            metadatas=[meta for _, _, meta in batch],
+            ids=[vec_id for vec_id, _, _ in batch],
+        )
+
+
+def _list_pdfs(pdf_dir: str) -> dict:
+    """디렉토리(하위 포함)의 PDF 파일을 {상대 경로: 절대 경로} 로 반환"""
+    paths = sorted(glob.glob(os.path.join(pdf_dir, "**", "*.pdf"), recursive=True))
+    return {os.path.relpath(path, pdf_dir): path for path in paths}
+
+
+class IngestProgress:
+    """인덱싱 진행 상황과 처리량 (pages/s, chunks/s)"""
+
+    def __init__(self):
+        self.files_total = 0
+        self.files_done = 0
+        self.pages = 0  # 파싱된 페이지 수
+        self.chunks = 0  # 새로 임베딩된 청크 수
+        self.started = None
+        self.finished = None
+
+    def report(self) -> str:
+        if self.started is None:
+            return "인덱싱 대기 중"
+        elapsed = max((self.finished or time.perf_counter()) - self.started, 1e-9)
+        state = "완료" if self.finished else "진행 중"
+        return (
+            f"인덱싱 {state}: {self.files_done}/{self.files_total} 파일, "
+            f"{self.pages} 페이지 ({self.pages / elapsed:.1f} pages/s), "
+            f"{self.chunks} 청크 ({self.chunks / elapsed:.1f} chunks/s), {elapsed:.1f}s"
+        )
+
+
+ingest_progress = IngestProgress()
+
+
+def ingest_directory(pdf_dir: str = PDF_DIR) -> None:
+    """PDF_DIR 의 모든 PDF 를 인덱싱한다.
+
+    변경된 PDF 의 페이지를 PAGES_PER_TASK 단위로 프로세스 풀에서 파싱하고, 파싱이 끝나는 대로
+    분할하여 EMBED_BATCH_SIZE 단위로 임베딩한다. 내용이 그대로인 페이지는 다시 임베딩하지 않으며,
+    사라진 페이지/파일의 벡터는 삭제한다. 인덱싱 중에도 이미 저장된 문서로 질의에 답할 수 있다.
+    """
+    global INDEX_VERSION
+    progress = ingest_progress
+    progress.started = time.perf_counter()
+    manifest = _load_manifest()
+    indexed = _indexed_pages()
+    sources = _list_pdfs(pdf_dir)
+    progress.files_total = len(sources)
+
+    # 디렉토리에서 사라진 PDF 의 벡터 삭제
+    for source in [s for s in manifest if s not in sources]:
+        removed_ids = [vec_id for h in set(manifest.pop(source).get("pages", [])) for vec_id in indexed.get(h, {}).get("ids", [])]
+        if removed_ids:
+            vectorstore.delete(ids=removed_ids)
+        logging.info(f"인덱스에서 제거: {source} ({len(removed_ids)} 청크)")
+
+    # 파일과 설정이 그대로인 PDF 는 파싱 없이 건너뜀 (웜 재시작)
+    files = {}  # 변경된 PDF 별 처리 상태
+    for source, path in sources.items():
+        entry = manifest.get(source, {})
+        file_hash = _file_sha256(path)
+        if entry.get("file_hash") == file_hash and entry.get("settings") == SETTINGS_FINGERPRINT:
+            progress.files_done += 1
+            continue
+        try:
+            n_pages = pdf_ingest.page_count(path)
+        except Exception as e:
+            logging.warning(f"PDF 열기 실패: {path} - {e}")
+            progress.files_done += 1
+            continue
+        files[source] = {
+            "path": path,
+            "file_hash": file_hash,
+            "n_pages": n_pages,
+            "pending": -(-n_pages // PAGES_PER_TASK),  # 남은 파싱 작업 수
+            "pages": {},  # 페이지 번호 → 페이지 해시
+            "failed": False,
+        }
+
+    buffer = []  # 임베딩 대기 중인 청크 (최대 EMBED_BATCH_SIZE 개)
+    queued = set()  # 이번 실행에서 확인/임베딩한 페이지 해시
+
+    def flush() -> None:
+        global INDEX_VERSION
+        if not buffer:
+            return
+        _embed_in_batches(buffer)
+        progress.chunks += len(buffer)
+        # 새 벡터가 추가되었으므로 캐시 키가 바뀌도록 버전 갱신
+        INDEX_VERSION = hashlib.sha256((INDEX_VERSION + buffer[-1][0]).encode("ascii")).hexdigest()[:16]
+        buffer.clear()
+
+    def finish_file(source: str) -> None:
+        global INDEX_VERSION
+        state = files.pop(source)
+        progress.files_done += 1
+        if state["failed"]:
+            return  # 매니페스트에 기록하지 않아 다음 실행 시 다시 시도
+        flush()  # 매니페스트에 기록하기 전에 이 파일의 청크가 모두 저장되도록 함
+        page_hashes = [state["pages"][page_no] for page_no in sorted(state["pages"])]
+        previous = set(manifest.get(source, {}).get("pages", []))
+        stale_ids = [vec_id for h in previous - set(page_hashes) for vec_id in indexed.get(h, {}).get("ids", [])]
+        if stale_ids:
+            vectorstore.delete(ids=stale_ids)
+        manifest[source] = {"file_hash": state["file_hash"], "settings": SETTINGS_FINGERPRINT, "pages": page_hashes}
+        _save_manifest(manifest)
+        INDEX_VERSION = _index_version(manifest)
+
+    for source in [s for s, state in files.items() if state["pending"] == 0]:
+        finish_file(source)  # 페이지가 없는 PDF
+
+    tasks = (
+        (source, start, min(start + PAGES_PER_TASK, state["n_pages"]))
+        for source, state in list(files.items())
+        for start in range(0, state["n_pages"], PAGES_PER_TASK)
+    )
+    last_report = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=INGEST_WORKERS, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = {}
+
+        def submit_more() -> None:
+            for source, start, stop in itertools.islice(tasks, MAX_TASKS_IN_FLIGHT - len(in_flight)):
+                in_flight[pool.submit(pdf_ingest.extract_pages, files[source]["path"], start, stop)] = source
+
+        submit_more()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = in_flight.pop(future)
+                state = files[source]
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    logging.warning(f"PDF 파싱 실패: {state['path']} - {e}")
+                    state["failed"] = True
+                    pages = []
+
+                # 파싱된 페이지를 바로 분할하여 임베딩 버퍼로 흘려보냄
+                for page_no, text in pages:
+                    page_hash = _page_hash(source, text)
+                    state["pages"][page_no] = page_hash
+                    progress.pages += 1
+                    if page_hash in queued:
+                        continue  # 같은 파일 안에서 내용이 같은 페이지는 한 번만 저장
+                    queued.add(page_hash)
+                    entry = indexed.get(page_hash)
+                    if entry is not None and _is_complete(entry):
+                        if entry["meta"].get("page") != page_no:
+                            # 내용은 그대로이고 위치만 바뀐 페이지: 다시 임베딩하지 않고 페이지 번호만 갱신
+                            entry["meta"] = {**entry["meta"], "page": page_no}
+                            vectorstore._collection.update(ids=entry["ids"], metadatas=[entry["meta"]] * len(entry["ids"]))
+                        continue
+                    if entry is not None:
+                        vectorstore.delete(ids=entry["ids"])  # 일부 청크만 저장된 페이지는 지우고 다시 임베딩
+                        del indexed[page_hash]
+                    chunks = splitter.split_text(text)
+                    for i, chunk in enumerate(chunks):
+                        meta = {"source": state["path"], "page": page_no, "page_hash": page_hash,
+                                "source_file": source, "n_chunks": len(chunks)}
+                        buffer.append((f"{page_hash}-{i}", chunk, meta))
+                        if len(buffer) >= EMBED_BATCH_SIZE:
+                            flush()
+
+                state["pending"] -= 1
+                if state["pending"] == 0:
+                    finish_file(source)
+
+            submit_more()
+            if time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                logging.info(progress.report())
+                last_report = time.perf_counter()
+
+    flush()
+    _save_manifest(manifest)
+    INDEX_VERSION = _index_version(manifest)
+    progress.finished = time.perf_counter()
+    logging.info(progress.report())
+
+
+if not IS_WORKER:
+    INDEX_VERSION = _index_version(_load_manifest())
+    # 인덱싱은 백그라운드 스레드에서 진행하고, 그동안 이미 인덱싱된 문서로 질의에 답함
+    threading.Thread(target=ingest_directory, name="rag-ingest", daemon=True).start()
+
+# RetrievalQA "stuff" 체인과 동일한 프롬프트 (검색된 청크를 모두 붙여서 한 번에 답변 생성)
+QA_PROMPT = (
+    "Use the following pieces of context to answer the question at the end. "
+    "If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\n"
+    "{context}\n\nQuestion: {question}\nHelpful Answer:"
+)
+
+
+class _LRUCache:
+    """크기 제한이 있는 단순 LRU 캐시 (키: (인덱스 버전, 정규화된 질문))"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+if not IS_WORKER:
+    retrieval_cache = _LRUCache()  # 질문 → 검색된 문서 목록
+    answer_cache = _LRUCache()  # 질문 → 생성된 답변
+    _generation_semaphore = asyncio.Semaphore(GENERATION_CONCURRENCY)
+
+
+def _normalize_query(query: str) -> str:
+    """대소문자/공백 차이만 있는 질문이 같은 캐시 항목을 쓰도록 정규화"""
+    return " ".join(query.lower().split())
+
+
+def _retrieve_batch(keys: List[str], queries: List[str]) -> List[list]:
+    """캐시에 없는 질문들을 한 번의 배치로 임베딩한 뒤 각각 벡터 검색 (블로킹 함수, 스레드에서 실행)
+
+    keys 는 캐시 키로 쓰는 정규화된 질문, queries 는 임베딩할 원래 질문 (같은 순서)
+    """
+    version = INDEX_VERSION
+    results = [retrieval_cache.get((version, key)) for key in keys]
+    missing = [i for i, docs in enumerate(results) if docs is None]
+    if missing:
+        vectors = embeddings.embed_documents([queries[i] for i in missing])  # 질문 임베딩을 한 번에 계산
+        for i, vec in zip(missing, vectors):
+            results[i] = vectorstore.similarity_search_by_vector(vec, k=RETRIEVAL_K)
+            retrieval_cache.put((version, keys[i]), results[i])
+    return results
+
+
+async def _generate(question: str, docs: list) -> str:
+    context = "\n\n".join(doc.page_content for doc in docs)
+    async with _generation_semaphore:  # 동시에 실행되는 LLM 호출 수 제한
+        message = await llm.ainvoke(QA_PROMPT.format(context=context, question=question))
+    return message.content
+
+
+async def _answer_batch(queries: List[str]) -> List[str]:
+    """질문 목록에 답변. 중복 질문은 한 번만 처리하고, 캐시된 답변은 바로 반환한다."""
+    version = INDEX_VERSION
+    normalized = [_normalize_query(q) for q in queries]
+    originals = {}  # 정규화된 질문 → 처음 나온 원래 질문 (임베딩/답변 생성에는 원문을 사용)
+    for key, q in zip(normalized, queries):
+        originals.setdefault(key, q)
+    answers = {key: answer_cache.get((version, key)) for key in originals}
+    unique = [key for key, answer in answers.items() if answer is None]
+
+    if unique:
+        texts = [originals[key] for key in unique]
+        docs_list = await asyncio.to_thread(_retrieve_batch, unique, texts)
+        generated = await asyncio.gather(
+            *(_generate(q, docs) for q, docs in zip(texts, docs_list)),
+            return_exceptions=True,
+        )
+        for key, answer in zip(unique, generated):
+            if isinstance(answer, Exception):
+                logging.error(f"답변 생성 실패: {originals[key]} - {answer}")
+                answers[key] = f"오류 발생: {answer}"  # 실패한 답변은 캐시하지 않음
+                continue
+            answers[key] = answer
+            answer_cache.put((version, key), answer)
+
+    return [answers[key] for key in normalized]
+
+
+async def ask_pdf(query: str) -> str:
+    """PDF 내용을 기반으로 질문에 답변합니다."""
+    logging.info(f"Received query: {query}")  # 사용자가 입력한 질문을 로그로 출력
+    return (await _answer_batch([query]))[0]  # 검색 → 답변 생성 (캐시된 답변이 있으면 바로 반환)
+
+
+async def ask_pdf_batch(queries: List[str]) -> List[str]:
+    """여러 질문에 PDF 내용을 기반으로 한꺼번에 답변합니다. 답변은 질문 순서대로 반환됩니다."""
+    logging.info(f"Received {len(queries)} queries")
+    return await _answer_batch(queries)
+
+
+def ingest_status() -> str:
+    """PDF 인덱싱 진행 상황과 처리량(pages/s, chunks/s)을 반환합니다."""
+    return ingest_progress.report()
+
+
+# 각 함수를 MCP 도구로 등록하여 외부 클라이언트(예: Cursor, Claude)가 호출 가능하게 만듦 (워커 프로세스에는 MCP 서버가 없음)
+if not IS_WORKER:
+    for tool in (ask_pdf, ask_pdf_batch, ingest_status):
+        mcp.tool()(tool)
+
+# MCP 서버 실행 (표준 입출력 방식으로 실행되며, 다른 프로그램에서 subprocess로 연결할 수 있음)
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
@@ -0,0 +1,252 @@
+"""게임 응답의 콘텐츠 협상과 압축 바이너리 인코딩
+
+`Accept: application/msgpack` 요청에는 필드 이름 없이 위치 기반 배열로 된 msgpack 을,
+그 외에는 Pydantic 의 JSON 직렬화기(model_dump_json)로 만든 JSON 을 반환합니다.
+
+msgpack 레이아웃 (모든 타임스탬프는 epoch 밀리초, 없으면 0 또는 nil)
+- room:  [ver, room_id, names, n_players, created_at, is_active, round_number, round_ends_at,
+          scores, lot, space_types, spaces]
+    names        플레이어 이름 테이블. 앞의 n_players 개가 players, 나머지는 그 외 점유자
+    scores       [name_idx, score, name_idx, score, ...]
+    lot          [순번, 대지위치주소, 건축면적, 옥내기계식, 옥외기계식, 옥내자주식, 옥외자주식, 총]
+    space_types  space_type 문자열 테이블
+    spaces       [count, ids<u4>, types<u1>, statuses<u1>, owners<i2>, occupied_at<i8>, expires_at<i8>]
+                 각 배열은 little-endian 으로 채운 bin. types 는 space_types 인덱스,
+                 statuses 는 STATUS_CODES 인덱스, owners 는 names 인덱스(-1: 없음)
+- stats: [ver, room_id, total, occupied, available, names, n_players, leaderboard, is_active,
+          round_number, round_ends_at, scores]   (leaderboard/scores 는 [name_idx, count, ...])
+- occupy: [ver, success, message, space]   space = [id, space_type, status, owner, occupied_at, expires_at] 또는 nil
+"""
+import sys
+from array import array
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import msgpack
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from models import GameRoom, OccupySpaceResponse, ParkingSpace, ParkingSpaceStatus
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+FORMAT_VERSION = 1
+STATUS_CODES = list(ParkingSpaceStatus)
+_STATUS_INDEX = {status: i for i, status in enumerate(STATUS_CODES)}
+
+# OpenAPI 문서에 msgpack 응답을 표시하기 위한 responses 설정
+MSGPACK_RESPONSES = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def _ms(value: Optional[datetime]) -> int:
+    return int(value.timestamp() * 1000) if value else 0
+
+
+def _packed(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class _Names:
+    """플레이어 이름 인턴 테이블"""
+
+    def __init__(self, players: List[str]):
+        self.table = list(players)
+        self.index = {name: i for i, name in enumerate(self.table)}
+
+    def __call__(self, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.table)
+            self.table.append(name)
+        return i
+
+    def pairs(self, counts: Dict[str, int]) -> List:
+        flat = []
+        for name, count in counts.items():
+            flat += (self(name), count)
+        return flat
+
+
+def encode_room(room: GameRoom) -> List:
+    names = _Names(room.players)
+    lot = room.parking_lot
+    type_table: List[str] = []
+    type_index: Dict[str, int] = {}
+    ids, types, statuses, owners, occupied_at, expires_at = [], [], [], [], [], []
+    for space in lot.spaces:
+        t = type_index.get(space.space_type)
+        if t is None:
+            t = type_index[space.space_type] = len(type_table)
+            type_table.append(space.space_type)
+        ids.append(space.id)
+        types.append(t)
+        statuses.append(_STATUS_INDEX[space.status])
+        owners.append(names(space.occupied_by))
+        occupied_at.append(_ms(space.occupied_at))
+        expires_at.append(_ms(space.expires_at))
+
+    scores = names.pairs(room.scores)
+    return [
+        FORMAT_VERSION,
+        room.room_id,
+        names.table,
+        len(room.players),
+        _ms(room.created_at),
+        room.is_active,
+        room.round_number,
+        _ms(room.round_ends_at) or None,
+        scores,
+        [lot.순번, lot.대지위치주소, lot.건축면적, lot.옥내_기계식_주차대수, lot.옥외_기계식_주차대수,
+         lot.옥내_자주식_주차대수, lot.옥외_자주식_주차대수, lot.총_주차대수],
+        type_table,
+        [
+            len(ids),
+            _packed("I", ids),
+            _packed("B", types),
+            _packed("B", statuses),
+            _packed("h", owners),
+            _packed("q", occupied_at),
+            _packed("q", expires_at),
+        ],
+    ]
+
+
+def encode_stats(stats: dict) -> List:
+    names = _Names(stats["players"])
+    leaderboard = names.pairs(stats["leaderboard"])
+    scores = names.pairs(stats["scores"])
+    return [
+        FORMAT_VERSION,
+        stats["room_id"],
+        stats["total_spaces"],
+        stats["occupied_spaces"],
+        stats["available_spaces"],
+        names.table,
+        len(stats["players"]),
+        leaderboard,
+        stats["is_active"],
+        stats["round_number"],
+        _ms(stats["round_ends_at"]) or None,
+        scores,
+    ]
+
+
+def _encode_space(space: Optional[ParkingSpace]) -> Optional[List]:
+    if space is None:
+        return None
+    return [space.id, space.space_type, _STATUS_INDEX[space.status], space.occupied_by,
+            _ms(space.occupied_at), _ms(space.expires_at)]
+
+
+def encode_occupy(result: OccupySpaceResponse) -> List:
+    return [FORMAT_VERSION, result.success, result.message, _encode_space(result.space)]
+
+
+def _accept_q(ranges: List[Tuple[str, str, float]], media_type: str, exact: bool = False) -> float:
+    """media_type 에 가장 구체적으로 일치하는 미디어 범위의 q 값 (일치하는 범위가 없으면 0)"""
+    main, sub = media_type.split("/")
+    best, best_q = -1, 0.0
+    for r_main, r_sub, q in ranges:
+        if r_main == main and r_sub == sub:
+            specificity = 2
+        elif exact:
+            continue
+        elif r_main == main and r_sub == "*":
+            specificity = 1
+        elif r_main == "*" and r_sub == "*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best:
+            best, best_q = specificity, q
+    return best_q
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media_range, *params = part.split(";")
+        media_range = media_range.strip().lower()
+        if "/" not in media_range:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        r_main, r_sub = media_range.split("/", 1)
+        ranges.append((r_main, r_sub, q))
+    return ranges
+
+
+def wants_msgpack(request: Request) -> bool:
+    """msgpack 의 q 값이 0보다 크고 JSON 의 q 값 이상이면 msgpack 을 선택합니다
+
+    기본 형식은 JSON 이므로 msgpack 은 Accept 에 명시된 경우에만 고려합니다 (*/* 만으로는 선택하지 않음).
+    """
+    ranges = _parse_accept(request.headers.get("accept", ""))
+    msgpack_q = max(_accept_q(ranges, MSGPACK_MEDIA_TYPE, exact=True),
+                    _accept_q(ranges, "application/x-msgpack", exact=True))
+    return msgpack_q > 0 and msgpack_q >= _accept_q(ranges, "application/json")
+
+
+def negotiate(request: Request, model: BaseModel, compact: Callable[[], List]) -> Response:
+    """Accept 헤더에 따라 msgpack(위치 기반) 또는 JSON 응답을 만듭니다"""
+    # 응답 형식이 Accept 헤더에 따라 달라지므로 캐시가 다른 형식을 돌려주지 않도록 Vary 지정
+    if wants_msgpack(request):
+        return Response(msgpack.packb(compact(), use_bin_type=True), media_type=MSGPACK_MEDIA_TYPE, headers=VARY_ACCEPT)
+    return Response(model.model_dump_json(), media_type="application/json", headers=VARY_ACCEPT)
+
+
+if __name__ == "__main__":
+    # 벤치마크: 기존 방식(FastAPI jsonable_encoder + json.dumps) 대비 인코딩 시간과 크기
+    import json
+    import time
+    from fastapi.encoders import jsonable_encoder
+    from models import ParkingLot
+
+    def make_room(n_spaces: int, n_players: int = 10) -> GameRoom:
+        players = [f"플레이어{i}" for i in range(n_players)]
+        kinds = ["옥내 기계식", "옥외 기계식", "옥내 자주식", "옥외 자주식"]
+        now = datetime.now()
+        spaces = []
+        for i in range(1, n_spaces + 1):
+            space = ParkingSpace(id=i, space_type=kinds[i % 4])
+            if i % 2:
+                space.status = ParkingSpaceStatus.OCCUPIED
+                space.occupied_by = players[i % n_players]
+                space.occupied_at = now
+                space.expires_at = now
+            spaces.append(space)
+        lot = ParkingLot(순번=1, 대지위치주소="서울특별시 중구 세종대로 110", 건축면적="1234.5",
+                         옥내_기계식_주차대수=n_spaces // 4, 옥외_기계식_주차대수=n_spaces // 4,
+                         옥내_자주식_주차대수=n_spaces // 4, 옥외_자주식_주차대수=n_spaces - 3 * (n_spaces // 4),
+                         총_주차대수=n_spaces, spaces=spaces)
+        return GameRoom(room_id="abcd1234", parking_lot=lot, players=players, created_at=now,
+                        round_number=1, round_ends_at=now, scores={p: 3 for p in players})
+
+    def bench(fn, repeat: int) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    print(f"{'spaces':>6} | {'format':<28} | {'bytes':>8} | {'encode µs':>10}")
+    for n_spaces in (20, 200, 2000):
+        room = make_room(n_spaces)
+        repeat = max(20, 20000 // n_spaces)
+        encoders = {
+            "JSON (jsonable_encoder)": lambda: json.dumps(jsonable_encoder(room), ensure_ascii=False).encode(),
+            "JSON (model_dump_json)": lambda: room.model_dump_json().encode(),
+            "msgpack (positional)": lambda: msgpack.packb(encode_room(room), use_bin_type=True),
+        }
+        for label, fn in encoders.items():
+            print(f"{n_spaces:>6} | {label:<28} | {len(fn()):>8} | {bench(fn, repeat):>10.1f}")